@@ -0,0 +1,331 @@
+# Hardware-free benchmarks for the GlowBit library's drawing and output paths.
+#
+# A fake rpi_ws281x module is installed before glowbit is imported so the suite runs on any machine with CPython 3.
+#
+# Usage:
+#   python3 benchmarks/bench.py                          Run every benchmark and print a table
+#   python3 benchmarks/bench.py --json results.json      Also write the results as JSON
+#   python3 benchmarks/bench.py --baseline results.json  Compare against saved results; exits with status 1 if any benchmark is slower than the tolerance
+#   python3 benchmarks/bench.py --backend Null           Use the null output backend to measure drawing cost without any transmit cost
+#
+# Each benchmark times one "frame" of work, eg: pixelSetXY sets every pixel on the display once per frame. The table reports frames per second and operations (pixels, characters, etc.) per second.
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import types
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DISPLAYS = ["stick", "matrix4x4", "matrix8x8"]
+TILES = [1, 4, 16, 64]
+
+## @brief In-process stand-in for rpi_ws281x.PixelStrip. Stores pixel values but transmits nothing.
+class FakePixelStrip():
+    def __init__(self, num, pin, *args, **kwargs):
+        self.num = num
+        self.leds = [0 for _ in range(num)]
+
+    def begin(self):
+        pass
+
+    def setPixelColor(self, n, colour):
+        self.leds[n] = colour
+
+    # Like rpi_ws281x, a slice assignment writes the one value to every LED in the slice
+    def __setitem__(self, pos, value):
+        if isinstance(pos, slice):
+            for n in range(*pos.indices(self.num)):
+                self.leds[n] = value
+        else:
+            self.leds[pos] = value
+
+    def show(self):
+        pass
+
+def _installFakeStrip():
+    ws = types.ModuleType("rpi_ws281x")
+    ws.PixelStrip = FakePixelStrip
+    sys.modules["rpi_ws281x"] = ws
+
+def _importGlowbit():
+    _installFakeStrip()
+    sys.path.insert(0, os.path.join(_ROOT, "glowbit"))
+    import glowbit
+    return glowbit
+
+## @brief Creates a display with tiles modules and an effectively unlimited frame rate
+def makeDisplay(glowbit, name, tiles, backend = "Hardware"):
+    if name == "stick":
+        d = glowbit.stick(numLEDs = 8*tiles, brightness = 255, backend = backend)
+    elif name == "matrix4x4":
+        d = glowbit.matrix4x4(tiles = tiles, brightness = 255, backend = backend)
+    else:
+        rows = 1
+        while rows*rows < tiles:
+            rows *= 2
+        d = glowbit.matrix8x8(tileRows = rows, tileCols = tiles // rows, brightness = 255, backend = backend)
+    d.updateRateLimitFPS(1000000000)
+    return d
+
+# Each benchmark takes a display and returns (frame, opsPerFrame) where frame() performs one frame of work, or None if it doesn't apply to that display type.
+
+def benchPixelsShow(glowbit, d):
+    d.pixelsFill(0x123456)
+    return (lambda: d.pixelsShow(force = True)), d.numLEDs
+
+def benchPixelsFill(glowbit, d):
+    return (lambda: d.pixelsFill(0x123456)), d.numLEDs
+
+def benchBufferAddSaturating(glowbit, d):
+    import array
+    other = array.array("I", [0x204060*(k % 5) for k in range(d.numLEDs)])
+    def frame():
+        d.bufferScale(192)
+        d.bufferAddSaturating(other)
+    return frame, d.numLEDs
+
+def benchPixelSetXY(glowbit, d):
+    if not isinstance(d, glowbit.glowbitMatrix):
+        return None
+    numX = d.numLEDsX
+    numY = d.numLEDsY
+    def frame():
+        for y in range(numY):
+            for x in range(numX):
+                d.pixelSetXY(x, y, 0x123456)
+    return frame, d.numLEDs
+
+def benchDrawLine(glowbit, d):
+    if not isinstance(d, glowbit.glowbitMatrix):
+        return None
+    numX = d.numLEDsX
+    numY = d.numLEDsY
+    def frame():
+        d.drawLine(0, 0, numX-1, numY-1, 0x123456)
+        d.drawLine(0, numY//2, numX-1, numY//2, 0x123456)
+        d.drawLine(numX//2, 0, numX//2, numY-1, 0x123456)
+    return frame, 3
+
+def benchDrawCircle(glowbit, d):
+    if not isinstance(d, glowbit.glowbitMatrix):
+        return None
+    r = min(d.numLEDsX, d.numLEDsY) // 2
+    return (lambda: d.drawCircle(d.numLEDsX//2, d.numLEDsY//2, r, 0x123456)), 1
+
+def benchDrawRectangleFill(glowbit, d):
+    if not isinstance(d, glowbit.glowbitMatrix):
+        return None
+    # A panel inset by one pixel from each edge; filling the whole display takes a faster path
+    return (lambda: d.drawRectangleFill(1, 1, d.numLEDsX-2, d.numLEDsY-2, 0x123456)), (d.numLEDsX-2)*(d.numLEDsY-2)
+
+def benchBlit(glowbit, d):
+    if not isinstance(d, glowbit.glowbitMatrix):
+        return None
+    import array
+    icon = array.array("I", [0x123456*(k % 3) for k in range(64)])
+    numX = d.numLEDsX
+    numY = d.numLEDsY
+    def frame():
+        for y in range(0, numY, 8):
+            for x in range(0, numX, 8):
+                d.blit(icon, x, y, 8, 8)
+    return frame, ((numX + 7)//8)*((numY + 7)//8)
+
+def benchDrawChar(glowbit, d):
+    if not isinstance(d, glowbit.matrix8x8):
+        return None
+    text = "GlowBit!"
+    numX = d.numLEDsX
+    def frame():
+        x = 0
+        for c in text:
+            d.drawChar(c, x % numX, 0, 0x010101) # drawChar() adds to the buffer; a small colour value avoids overflow
+            x += 8
+    return frame, len(text)
+
+def benchUpdateTextScroll(glowbit, d):
+    if not isinstance(d, glowbit.matrix8x8):
+        return None
+    text = "The quick brown fox jumps over the lazy dog " * 4
+    def frame():
+        if not d.scrollingText:
+            d.addTextScroll(text)
+        d.updateTextScroll()
+    return frame, 1
+
+def benchUpdatePulses(glowbit, d):
+    if not isinstance(d, glowbit.stick):
+        return None
+    state = [0]
+    def frame():
+        if state[0] % 4 == 0:
+            d.addPulse(speed = 100, colour = [-1, 0xFFFFFF, -1], colourMap = "Rainbow")
+            d.addPulse(speed = -150, index = d.numLEDs, colour = [0x00FF00, 0x007F00])
+        state[0] += 1
+        d.pixelsFill(0)
+        d.updatePulses()
+    return frame, 1
+
+def benchUpdateGraph1D(glowbit, d):
+    if isinstance(d, glowbit.stick):
+        g = d.newGraph1D(0, d.numLEDs-1, 0, 255, colourMap = "Rainbow")
+    elif isinstance(d, glowbit.glowbitMatrix):
+        g = d.newGraph1D(0, d.numLEDsY-1, d.numLEDsY, "Up", 0, 255, colourMap = "Rainbow")
+    else:
+        return None
+    state = [0]
+    def frame():
+        state[0] = (state[0] + 37) % 256
+        d.updateGraph1D(g, state[0])
+    return frame, 1
+
+def benchUpdateGraph2D(glowbit, d):
+    if not isinstance(d, glowbit.glowbitMatrix):
+        return None
+    g = d.graph2D(originX = 0, originY = d.numLEDsY-1, width = d.numLEDsX, height = d.numLEDsY, colourMap = "Rainbow", bars = True)
+    state = [0]
+    def frame():
+        state[0] = (state[0] + 37) % 256
+        d.updateGraph2D(g, state[0])
+    return frame, 1
+
+def benchCircularRainbow(glowbit, d):
+    if not isinstance(d, glowbit.glowbitMatrix):
+        return None
+    # circularRainbow() draws and shows 255 frames per call
+    return (lambda: d.circularRainbow()), 255
+
+BENCHMARKS = [
+    ("pixelsShow", benchPixelsShow),
+    ("pixelsFill", benchPixelsFill),
+    ("bufferAddSaturating", benchBufferAddSaturating),
+    ("pixelSetXY", benchPixelSetXY),
+    ("drawLine", benchDrawLine),
+    ("drawCircle", benchDrawCircle),
+    ("drawRectangleFill", benchDrawRectangleFill),
+    ("blit", benchBlit),
+    ("drawChar", benchDrawChar),
+    ("updateTextScroll", benchUpdateTextScroll),
+    ("updatePulses", benchUpdatePulses),
+    ("updateGraph1D", benchUpdateGraph1D),
+    ("updateGraph2D", benchUpdateGraph2D),
+    ("circularRainbow", benchCircularRainbow),
+]
+
+## @brief Calls frame() repeatedly for at least minTime seconds and returns the number of calls per second
+def timeFrames(frame, minTime):
+    frame() # Warm up; also fills lazily built caches
+    n = 0
+    batch = 1
+    start = time.perf_counter()
+    elapsed = 0
+    while elapsed < minTime:
+        for _ in range(batch):
+            frame()
+        n += batch
+        batch *= 2
+        elapsed = time.perf_counter() - start
+    return n / elapsed
+
+def runBenchmarks(glowbit, displays, tiles, names, minTime, backend = "Hardware"):
+    results = []
+    for displayName in displays:
+        for t in tiles:
+            d = makeDisplay(glowbit, displayName, t, backend)
+            for name, bench in BENCHMARKS:
+                if name not in names:
+                    continue
+                setup = bench(glowbit, d)
+                if setup is None:
+                    continue
+                frame, opsPerFrame = setup
+                if name == "circularRainbow":
+                    # One call is 255 frames
+                    fps = 255*timeFrames(frame, minTime)
+                    ops = fps
+                else:
+                    fps = timeFrames(frame, minTime)
+                    ops = fps*opsPerFrame
+                results.append({
+                    "benchmark": name,
+                    "display": displayName,
+                    "tiles": t,
+                    "numLEDs": d.numLEDs,
+                    "framesPerSecond": fps,
+                    "opsPerSecond": ops,
+                })
+    return results
+
+def _key(r):
+    return (r["benchmark"], r["display"], r["tiles"])
+
+def printResults(results, baseline = None):
+    base = {}
+    if baseline is not None:
+        base = {_key(r): r for r in baseline["results"]}
+    print("%-20s %-10s %5s %7s %14s %14s %9s" % ("benchmark", "display", "tiles", "LEDs", "frames/s", "ops/s", "change"))
+    for r in results:
+        change = ""
+        b = base.get(_key(r))
+        if b is not None:
+            change = "%+8.1f%%" % (100*(r["framesPerSecond"]/b["framesPerSecond"] - 1))
+        print("%-20s %-10s %5d %7d %14.1f %14.1f %9s" % (r["benchmark"], r["display"], r["tiles"], r["numLEDs"], r["framesPerSecond"], r["opsPerSecond"], change))
+
+## @brief Returns a list of (result, baseline result) pairs where the result is more than tolerance percent slower than the baseline
+def regressions(results, baseline, tolerance):
+    base = {_key(r): r for r in baseline["results"]}
+    slower = []
+    for r in results:
+        b = base.get(_key(r))
+        if b is not None and r["framesPerSecond"] < b["framesPerSecond"]*(1 - tolerance/100):
+            slower.append((r, b))
+    return slower
+
+def main(argv = None):
+    parser = argparse.ArgumentParser(description = "Hardware-free GlowBit benchmarks")
+    parser.add_argument("--displays", default = ",".join(DISPLAYS), help = "Comma separated display types (default: %(default)s)")
+    parser.add_argument("--tiles", default = ",".join(str(t) for t in TILES), help = "Comma separated numbers of tiled modules (default: %(default)s)")
+    parser.add_argument("--benchmarks", default = ",".join(name for name, _ in BENCHMARKS), help = "Comma separated benchmark names (default: all)")
+    parser.add_argument("--time", type = float, default = 0.2, help = "Minimum time in seconds to run each benchmark (default: %(default)s)")
+    parser.add_argument("--backend", default = "Hardware", help = "Output backend; \"Hardware\" uses a fake rpi_ws281x strip (default: %(default)s)")
+    parser.add_argument("--json", help = "Write results to this JSON file")
+    parser.add_argument("--baseline", help = "Compare results against this JSON file, as written by --json")
+    parser.add_argument("--tolerance", type = float, default = 10, help = "Percentage slowdown against the baseline reported as a regression (default: %(default)s)")
+    args = parser.parse_args(argv)
+
+    glowbit = _importGlowbit()
+    displays = args.displays.split(",")
+    tiles = [int(t) for t in args.tiles.split(",")]
+    names = args.benchmarks.split(",")
+
+    results = runBenchmarks(glowbit, displays, tiles, names, args.time, args.backend)
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    printResults(results, baseline)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({
+                "python": platform.python_implementation() + " " + platform.python_version(),
+                "machine": platform.machine(),
+                "backend": args.backend,
+                "results": results,
+            }, f, indent = 1)
+
+    if baseline is not None:
+        slower = regressions(results, baseline, args.tolerance)
+        for r, b in slower:
+            print("REGRESSION: %s on %s x%d: %.1f frames/s, baseline %.1f" % (r["benchmark"], r["display"], r["tiles"], r["framesPerSecond"], b["framesPerSecond"]))
+        if slower:
+            return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
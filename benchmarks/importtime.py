@@ -0,0 +1,82 @@
+# Checks the time taken to import the GlowBit library against a budget, using python -X importtime.
+#
+# Importing glowbit should be fast and free of side effects: hardware modules, NumPy and the font are loaded when first needed, not at import.
+#
+# Usage:
+#   python3 benchmarks/importtime.py                Exits with status 1 if the import is slower than the budget or loads a deferred module
+#   python3 benchmarks/importtime.py --budget 10    Sets the budget in milliseconds
+#
+# The import is timed in fresh interpreters several times and the fastest run is compared with the budget, as the first run may include compiling glowbit.py to bytecode.
+
+import argparse
+import os
+import subprocess
+import sys
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules which must not be loaded by "import glowbit"
+DEFERRED = ["rpi_ws281x", "numpy", "petme128", "threading", "asyncio"]
+
+## @brief Imports glowbit in a fresh interpreter
+#
+# \return A tuple (importTimes, loaded) where importTimes maps glowbit and each module it imported to its cumulative import time in microseconds and loaded is a list of modules in DEFERRED which were loaded
+def importOnce():
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.path.join(_ROOT, "glowbit") + os.pathsep + env.get("PYTHONPATH", "")
+    # Without cached bytecode every run would compile glowbit.py
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    code = "import sys, glowbit; print(','.join(m for m in %r if m in sys.modules))" % (DEFERRED,)
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", code], env = env, capture_output = True, text = True, check = True)
+    importTimes = {}
+    # Modules are listed after the modules they import, indented by nesting level
+    nested = {}
+    for line in proc.stderr.splitlines():
+        # Lines look like: "import time:       self [us] |  cumulative | imported package"
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3 or not fields[1].strip().isdigit():
+            continue
+        name = fields[2].strip()
+        if fields[2][:2].strip() == "":
+            nested[name] = int(fields[1])
+        else:
+            if name == "glowbit":
+                importTimes = nested
+                importTimes[name] = int(fields[1])
+            nested = {}
+    loaded = [m for m in proc.stdout.strip().split(",") if m]
+    return importTimes, loaded
+
+def main(argv = None):
+    parser = argparse.ArgumentParser(description = "Check the GlowBit import time budget")
+    parser.add_argument("--budget", type = float, default = 20, help = "Maximum import time in milliseconds (default: %(default)s)")
+    parser.add_argument("--runs", type = int, default = 5, help = "Number of fresh interpreters to time (default: %(default)s)")
+    args = parser.parse_args(argv)
+
+    best = None
+    loaded = []
+    for _ in range(max(1, args.runs)):
+        importTimes, loaded = importOnce()
+        t = importTimes["glowbit"]
+        if best is None or t < best[0]:
+            best = (t, importTimes)
+
+    t, importTimes = best
+    print("import glowbit: %.1f ms (budget %.1f ms)" % (t/1000, args.budget))
+    slowest = sorted(importTimes.items(), key = lambda item: item[1], reverse = True)[:5]
+    for name, us in slowest:
+        print("  %-30s %8.1f ms" % (name, us/1000))
+
+    failed = False
+    if loaded:
+        print("FAIL: import glowbit loaded deferred modules: " + ", ".join(loaded))
+        failed = True
+    if t > args.budget*1000:
+        print("FAIL: import glowbit exceeded the budget")
+        failed = True
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,4 +1,5 @@
 import os
+import sys
 _SYSNAME = os.uname().sysname
 
 if _SYSNAME == 'rp2':
@@ -6,12 +7,19 @@ if _SYSNAME == 'rp2':
     import micropython
     import rp2
 
-if _SYSNAME == 'Linux':
-    import rpi_ws281x as ws
+# NumPy is optional; on Linux it vectorises the brightness scaling done by the output backends and the whole-buffer operations such as bufferAddSaturating(). It is imported by _importNumpy() when the first display or backend is constructed, as importing it takes longer than importing the rest of this module.
+numpy = None
+_numpyImported = False
 
-    # Dummy ptr32() for within micropython.viper
+# The null and recording backends let this module run under CPython on any operating system, not only the Raspberry Pi's Linux
+if sys.implementation.name != 'micropython':
+    # Dummy ptr32(), ptr16() and ptr8() for within micropython.viper
     def ptr32(arg):
         return arg
+    def ptr16(arg):
+        return arg
+    def ptr8(arg):
+        return arg
     # Dummy class for @micropython decorator
     class micropython():
         def viper(func):
@@ -30,11 +38,68 @@ if _SYSNAME == 'Linux':
             return wrapper 
 
 
-from petme128 import petme128
 import time
 import array
 import gc
 
+# Monotonic microsecond clock used by the frame rate limiter
+if _SYSNAME == 'rp2':
+    _ticks_us = time.ticks_us
+    _ticks_diff = time.ticks_diff
+    _ticks_add = time.ticks_add
+
+    def _sleep_us(us):
+        time.sleep_ms(us // 1000)
+else:
+    def _ticks_us():
+        return time.monotonic_ns() // 1000
+
+    def _ticks_diff(a, b):
+        return a - b
+
+    def _ticks_add(a, b):
+        return a + b
+
+    def _sleep_us(us):
+        time.sleep(us / 1000000)
+
+# Imports NumPy, if it is installed, into the module global numpy
+def _importNumpy():
+    global numpy, _numpyImported
+    if _numpyImported:
+        return
+    _numpyImported = True
+    if sys.implementation.name != 'micropython':
+        try:
+            import numpy
+        except ImportError:
+            numpy = None
+
+# The petme128 font bitmap, loaded by _font() on first use
+_petme128 = None
+
+# Returns the petme128 font bitmap. Works whether this module is installed stand-alone alongside petme128.py or as part of a package.
+def _font():
+    global _petme128
+    if _petme128 is None:
+        try:
+            from .petme128 import petme128
+        except ImportError:
+            from petme128 import petme128
+        _petme128 = petme128
+    return _petme128
+
+# Returns the asyncio module. Imported on first use as most applications don't need it. MicroPython versions prior to 1.21 name it uasyncio.
+def _asyncio():
+    try:
+        import asyncio
+    except ImportError:
+        import uasyncio as asyncio
+    return asyncio
+
+# The frame rate limiter sleeps until this many microseconds before a frame's deadline then spins for the remainder
+_SPIN_US = 1000
+
 
 ## @brief
 #
@@ -126,6 +191,8 @@ class colourFunctions():
 # Custom colour map methods can be written and passed to several GlowBit library methods (eg: glowbit.stick.graph1D) but must accept the same positional arguments as the methods in this class:
 #
 # def colourMapFunction(self, index, minIndex, maxIndex):
+#
+# A colourGradient object can be passed instead of a colour map method and is faster, as colours are read from its precomputed table.
 
 class colourMaps():
 
@@ -149,9 +216,94 @@ class colourMaps():
     def colourMapRainbow(self, index, minIndex, maxIndex):
         return self.wheel(int(((index-minIndex)*255)/(maxIndex-minIndex)))
 
-## @brief Low-level methods common to all GlowBit classes
+## @brief A colour gradient precomputed into a table of 256 packed 32-bit GlowBit colour values.
+#
+# A colourGradient object can be passed anywhere a colourMap is accepted. Library methods which draw with a colour map read colours directly from the table instead of calling a function for each pixel. A colourGradient can also be called like a colour map method: gradient(index, minIndex, maxIndex).
+#
+# The index range [minIndex, maxIndex] is mapped onto table entries 0 to 255. Indices outside this range are clamped to the end colours, or wrap around if the gradient is cyclic.
+
+class colourGradient():
+
+    ## @brief Initialisation routine for colourGradient objects.
+    #
+    # \param stops Either the name of a built-in gradient or a list of colour stops. A list of packed 32-bit GlowBit colour values is spaced evenly over the gradient. A list of (position, colour) tuples places each colour at a table position in the range [0,255]; positions must be in increasing order. Colours are linearly interpolated between stops. Built-in gradients are:
+    #   * "Rainbow": The colourFunctions.wheel() colour wheel, as drawn by colourMaps.colourMapRainbow()
+    #   * "Hue": The fully saturated hue wheel: red, yellow, green, cyan, blue, magenta and back to red
+    # \param cyclic If True then indices outside the range [minIndex, maxIndex] wrap around the gradient instead of being clamped to its end colours. As with colourFunctions.wheel() the table repeats every 255 entries, so table entry 255 should match entry 0. The built-in gradients are always cyclic.
+
+    def __init__(self, stops = "Rainbow", cyclic = False):
+        ## The 256-entry array.array("I") of packed 32-bit GlowBit colour values
+        self.lut = array.array("I", [0 for _ in range(256)])
+        if type(stops) is str:
+            if stops == "Hue":
+                stops = [0xFF0000, 0xFFFF00, 0x00FF00, 0x00FFFF, 0x0000FF, 0xFF00FF, 0xFF0000]
+            elif stops != "Rainbow":
+                print("Invalid gradient \"", stops, "\".")
+                print("Valid options: Rainbow, Hue, or a list of colour stops")
+                print("Defaulting to Rainbow")
+                stops = "Rainbow"
+            cyclic = True
+        ## True if indices wrap around the gradient, False if they are clamped to its end colours
+        self.cyclic = cyclic
+        if stops == "Rainbow":
+            wheel = colourFunctions().wheel
+            for i in range(256):
+                self.lut[i] = wheel(i)
+        else:
+            self._interpolate(stops)
 
-class glowbit(colourFunctions, colourMaps):
+    def _interpolate(self, stops):
+        if len(stops) == 0:
+            return
+        if type(stops[0]) is not tuple:
+            if len(stops) == 1:
+                stops = [(0, stops[0])]
+            else:
+                stops = [((255*i)//(len(stops)-1), c) for i, c in enumerate(stops)]
+        lut = self.lut
+        pos, colour = stops[0]
+        for i in range(0, min(int(pos), 255) + 1):
+            lut[i] = colour
+        for nextPos, nextColour in stops[1:]:
+            pos = int(pos)
+            nextPos = min(int(nextPos), 255)
+            span = nextPos - pos
+            r0, g0, b0 = (colour >> 16) & 0xFF, (colour >> 8) & 0xFF, colour & 0xFF
+            dr, dg, db = ((nextColour >> 16) & 0xFF) - r0, ((nextColour >> 8) & 0xFF) - g0, (nextColour & 0xFF) - b0
+            for i in range(max(pos + 1, 0), nextPos + 1):
+                t = i - pos
+                lut[i] = ((r0 + (dr*t)//span) << 16) | ((g0 + (dg*t)//span) << 8) | (b0 + (db*t)//span)
+            pos, colour = nextPos, nextColour
+        for i in range(max(int(pos) + 1, 0), 256):
+            lut[i] = colour
+
+    ## @brief Returns the gradient's colour for index, as a colour map method would.
+    #
+    # \param index The value to be mapped
+    # \param minIndex The value of index mapped to the start of the gradient
+    # \param maxIndex The value of index mapped to the end of the gradient
+    # \return The 32-bit packed GlowBit colour value
+
+    def __call__(self, index, minIndex, maxIndex):
+        t = int(((index-minIndex)*255)/(maxIndex-minIndex))
+        if self.cyclic:
+            return self.lut[t % 255]
+        return self.lut[0 if t < 0 else 255 if t > 255 else t]
+
+# Shared built-in gradients, created by _builtinGradient() on first use
+_gradients = {}
+
+# Returns the shared colourGradient object for a built-in gradient name
+def _builtinGradient(name):
+    if name not in _gradients:
+        _gradients[name] = colourGradient(name)
+    return _gradients[name]
+
+## @brief Output backend which drives GlowBit LEDs from a Raspberry Pi Pico PIO state machine.
+#
+# Frames are converted in full into dimmer_ar and then handed to the PIO state machine in one transfer. If this MicroPython build supports rp2.DMA a DMA channel, paced by the state machine's TX FIFO, feeds it each frame and show() returns while the frame is still being sent.
+
+class pioBackend():
     @rp2.asm_pio(sideset_init=rp2.PIO.OUT_LOW, out_shiftdir=rp2.PIO.SHIFT_LEFT, autopull=True, pull_thresh=24)
     def _ws2812():
         T1 = 2
@@ -166,46 +318,931 @@ class glowbit(colourFunctions, colourMaps):
         nop()                   .side(0)    [T2 - 1]
         wrap()
 
+    ## @brief Initialisation routine for the PIO backend
+    #
+    # \param numLEDs The number of LEDs in the display chain
+    # \param pin The GPIO pin connected to the GlowBit display
+    # \param sm The PIO state machine to generate the GlowBit data stream. Valid values are in the range [0,7].
+    def __init__(self, numLEDs, pin = 18, sm = 0):
+        self.numLEDs = numLEDs
+        self.dimmer_ar = array.array("I", [0 for _ in range(numLEDs)])
+        self.sm = rp2.StateMachine(sm, self._ws2812, freq=8_000_000, sideset_base=Pin(pin))
+        self.sm.active(1)
+        self._dma = None
+        if hasattr(rp2, "DMA"):
+            # Each PIO block has 4 state machines. Block n is at 0x50200000 + n*0x100000 with the TX FIFO registers from offset 0x10, and its TX DREQ numbers start at 8*n.
+            pio = sm // 4
+            self._dma = rp2.DMA()
+            self._dmaWrite = 0x50200000 + 0x100000*pio + 0x10 + 4*(sm % 4)
+            self._dmaCtrl = self._dma.pack_ctrl(size = 2, inc_write = False, treq_sel = 8*pio + sm % 4)
+        # The output table show() was last called with and the same table pre-shifted into the GRB positions the PIO program expects
+        self._table = None
+        self._packed = None
+
+    def show(self, src, lo, hi, table):
+        dma = self._dma
+        if dma is not None:
+            # The previous frame may still be streaming out of dimmer_ar
+            while dma.active():
+                pass
+        if table is not self._table:
+            self._packed = _packTable(table, 16, 24, 8)
+            self._table = table
+        self._convert(src, lo, hi, self._packed)
+        # LEDs after hi are unchanged so they don't need to be sent
+        if dma is not None:
+            dma.config(read = self.dimmer_ar, write = self._dmaWrite, count = hi, ctrl = self._dmaCtrl, trigger = True)
+        elif hi == self.numLEDs:
+            self.sm.put(self.dimmer_ar)
+        else:
+            self.sm.put(memoryview(self.dimmer_ar)[:hi])
+
+    # Converts LEDs [lo, hi) of src into dimmer_ar. Values are stored in GRB order, pre-shifted into the top 24 bits as the PIO program shifts data out MSB first.
     @micropython.viper
-    def _pixelsShowPico(self):
+    def _convert(self, src, lo: int, hi: int, packed):
+        ar = ptr32(self.dimmer_ar)
+        s = ptr32(src)
+        t = ptr32(packed)
+        for i in range(lo, hi):
+            c = int(s[i])
+            ar[i] = t[(c >> 16) & 0xFF] | t[256 + ((c >> 8) & 0xFF)] | t[512 + (c & 0xFF)]
+
+## @brief Output backend which drives GlowBit LEDs from a Raspberry Pi using the rpi_ws281x module.
+#
+# The display can be split between the Raspberry Pi's two PWM channels, one segment on pin 18 or 12 and the other on pin 13 or 19. Both channels are rendered with a single call to the rpi_ws281x library, so the two segments are transmitted at the same time.
+
+class ws281xBackend():
+    # This backend drives the segments of a display itself; see registerBackend()
+    segmented = True
+
+    # The PWM channel of each pin which rpi_ws281x can drive from PWM
+    _pwmChannels = {12: 0, 18: 0, 13: 1, 19: 1}
+
+    ## @brief Initialisation routine for the rpi_ws281x backend
+    #
+    # \param numLEDs The number of LEDs in the display chain
+    # \param pin The GPIO pin connected to the GlowBit display. Only pins 18 and 12 are valid.
+    # \param sm Unused. For compatibility with the backend API.
+    # \param segments A list of up to two (pin, start, stop) tuples, each driving LEDs [start, stop) from pin, or None to drive every LED from pin. The segments must use different PWM channels: one pin 18 or 12, the other pin 13 or 19.
+    def __init__(self, numLEDs, pin = 18, sm = 0, segments = None):
+        _importNumpy()
+        # The output table show() was last called with and the same table pre-shifted into 0x00RRGGBB positions
+        self._table = None
+        self._packed = None
+        if segments is not None:
+            channels = [self._pwmChannels.get(segment[0]) for segment in segments]
+            if len(segments) > 2 or None in channels or len(set(channels)) != len(channels):
+                print("Invalid segments \"", segments, "\".")
+                print("Valid options: one segment on pin 18 or 12 and one segment on pin 13 or 19")
+                print("Defaulting to a single output on pin", pin)
+                segments = None
+        ## The rpi_ws281x PixelStrip, or None if the display is split into segments
+        self.strip = None
+        self._channels = None
+        if segments is None:
+            import rpi_ws281x as ws
+            self.strip = ws.PixelStrip(numLEDs, pin)
+            self.strip.begin()
+        else:
+            self._openChannels(segments)
+
+    # Configures an rpi_ws281x channel for each segment using the library's low-level interface, as PixelStrip drives only one channel
+    def _openChannels(self, segments):
+        import _rpi_ws281x as ws
+        self._ws = ws
+        self._leds = ws.new_ws2811_t()
+        for ch in range(2):
+            channel = ws.ws2811_channel_get(self._leds, ch)
+            ws.ws2811_channel_t_gpionum_set(channel, 0)
+            ws.ws2811_channel_t_count_set(channel, 0)
+            ws.ws2811_channel_t_invert_set(channel, 0)
+            ws.ws2811_channel_t_brightness_set(channel, 0)
+        # A list of (start, stop, channel) tuples, one for each segment
+        self._channels = []
+        for pin, start, stop in segments:
+            channel = ws.ws2811_channel_get(self._leds, self._pwmChannels[pin])
+            ws.ws2811_channel_t_gpionum_set(channel, pin)
+            ws.ws2811_channel_t_count_set(channel, stop - start)
+            ws.ws2811_channel_t_brightness_set(channel, 255)
+            ws.ws2811_channel_t_strip_type_set(channel, ws.WS2811_STRIP_GRB)
+            self._channels.append((start, stop, channel))
+        ws.ws2811_t_freq_set(self._leds, 800000)
+        ws.ws2811_t_dmanum_set(self._leds, 10)
+        resp = ws.ws2811_init(self._leds)
+        if resp != ws.WS2811_SUCCESS:
+            raise RuntimeError("ws2811_init failed with code {0} ({1})".format(resp, ws.ws2811_get_return_t_str(resp)))
+
+    def show(self, src, lo, hi, table):
+        if table is not self._table:
+            self._packed = _packTable(table, 16, 8, 0)
+            self._table = table
+        if self._channels is not None:
+            self._showChannels(src, lo, hi)
+        else:
+            # A PixelStrip slice assignment writes one colour to every LED in the slice, so each LED is set individually
+            if numpy is not None:
+                colours = _convertNumpy(src, self._packed, lo, hi).tolist()
+            else:
+                t = self._packed
+                colours = [t[(c >> 16) & 0xFF] | t[256 + ((c >> 8) & 0xFF)] | t[512 + (c & 0xFF)] for c in src[lo:hi]]
+            setPixelColor = self.strip.setPixelColor
+            i = lo
+            for c in colours:
+                setPixelColor(i, c)
+                i += 1
+            self.strip.show()
+
+    # Writes the modified LEDs of each segment to its channel, then transmits both channels together
+    def _showChannels(self, src, lo, hi):
+        ws = self._ws
+        t = self._packed
+        for start, stop, channel in self._channels:
+            a = max(lo, start)
+            b = min(hi, stop)
+            if a >= b:
+                continue
+            if numpy is not None:
+                colours = _convertNumpy(src, t, a, b).tolist()
+            else:
+                colours = [t[(c >> 16) & 0xFF] | t[256 + ((c >> 8) & 0xFF)] | t[512 + (c & 0xFF)] for c in src[a:b]]
+            i = a - start
+            for c in colours:
+                ws.ws2811_led_set(channel, i, c)
+                i += 1
+        # Waits for the previous frame's DMA transfers to finish before starting both channels
+        resp = ws.ws2811_render(self._leds)
+        if resp != ws.WS2811_SUCCESS:
+            raise RuntimeError("ws2811_render failed with code {0} ({1})".format(resp, ws.ws2811_get_return_t_str(resp)))
+
+## @brief Output backend which discards every frame.
+#
+# Useful for measuring the cost of drawing, without any transmit cost, on machines with no GlowBit hardware attached.
+
+class nullBackend():
+
+    ## @brief Initialisation routine for the null backend. All parameters are ignored.
+    def __init__(self, numLEDs, pin = 18, sm = 0):
+        ## The number of frames shown
+        self.frameCount = 0
+
+    def show(self, src, lo, hi, table):
+        self.frameCount += 1
+
+## @brief Output backend which records shown frames, with timestamps, into a ring buffer.
+#
+# Each recorded frame is an array of packed 0x00RRGGBB colour values after brightness scaling and colour correction, ie: the colours which would have been sent to the LEDs. All buffers are allocated at construction so recording a frame does not allocate memory.
+#
+# The recorded frames of a display are available through its backend attribute, eg: matrix.backend.getFrames()
+
+class recordingBackend():
+
+    ## @brief Initialisation routine for the recording backend
+    #
+    # To record more than the default number of frames pass a function as the backend argument of a GlowBit display's constructor, eg: backend = lambda numLEDs, pin, sm: recordingBackend(numLEDs, depth = 1000)
+    #
+    # \param numLEDs The number of LEDs in the display chain
+    # \param pin Unused. For compatibility with the backend API.
+    # \param sm Unused. For compatibility with the backend API.
+    # \param depth The number of frames kept. Once full the oldest frame is overwritten.
+    def __init__(self, numLEDs, pin = 18, sm = 0, depth = 64):
+        if depth < 1:
+            depth = 1
+        _importNumpy()
+        self.depth = depth
+        self.frames = [array.array("I", [0 for _ in range(numLEDs)]) for _ in range(depth)]
+        self.timestamps = [0 for _ in range(depth)]
+        self._table = None
+        self._packed = None
+        # Index of the most recently recorded frame
+        self._last = depth - 1
+        ## The number of frames shown since construction or the last call to clear()
+        self.frameCount = 0
+
+    def show(self, src, lo, hi, table):
+        if table is not self._table:
+            self._packed = _packTable(table, 16, 8, 0)
+            self._table = table
+        prev = self.frames[self._last]
+        self._last = (self._last + 1) % self.depth
+        frame = self.frames[self._last]
+        # Only LEDs [lo, hi) have changed since the previous frame
+        frame[:] = prev
+        if numpy is not None:
+            numpy.frombuffer(frame, dtype=numpy.uint32)[lo:hi] = _convertNumpy(src, self._packed, lo, hi)
+        else:
+            _convertInto(frame, src, lo, hi, self._packed)
+        self.timestamps[self._last] = _ticks_us()
+        self.frameCount += 1
+
+    ## @brief Returns the recorded frames, oldest first.
+    #
+    # The frame arrays are the recording buffers themselves; they are overwritten as further frames are shown.
+    #
+    # \return A list of (timestamp, frame) tuples. timestamp is in microseconds from the same clock used by the frame rate limiter and frame is an array of packed 0x00RRGGBB colour values.
+    def getFrames(self):
+        n = min(self.frameCount, self.depth)
+        first = self._last - n + 1
+        return [(self.timestamps[(first + k) % self.depth], self.frames[(first + k) % self.depth]) for k in range(n)]
+
+    ## @brief Discards the recorded frames
+    def clear(self):
+        self.frameCount = 0
+
+# Builds the output table for a brightness, gamma curve and white balance. Entries [0,255] are the output levels of red input values [0,255], [256,511] of green and [512,767] of blue.
+#
+# Gamma correction is applied first, then each channel is scaled by its white balance gain and the brightness. Without a gamma curve and with gains of 256 the output is (value*brightness) >> 8, as it was before the table was introduced.
+#
+# \param br The brightness, [0,255]
+# \param curve A bytearray of the gamma corrected value of each input value [0,255], or None for no gamma correction
+# \param gains A list of the red, green and blue gains in units of 1/256, [0,256]
+def _buildOutputTable(br, curve, gains):
+    table = bytearray(768)
+    for ch in range(3):
+        k = gains[ch]*br
+        base = 256*ch
+        for v in range(256):
+            g = v if curve is None else curve[v]
+            table[base + v] = (g*k) >> 16
+    return table
+
+# Returns an output table with each channel's entries shifted into place, so a colour is converted by or-ing three entries
+def _packTable(table, rShift, gShift, bShift):
+    packed = array.array("I", [0 for _ in range(768)])
+    for v in range(256):
+        packed[v] = table[v] << rShift
+        packed[256 + v] = table[256 + v] << gShift
+        packed[512 + v] = table[512 + v] << bShift
+    return packed
+
+# Writes LEDs [lo, hi) of src, converted by the packed 0x00RRGGBB output table, into dst
+@micropython.viper
+def _convertInto(dst, src, lo: int, hi: int, packed):
+    d = ptr32(dst)
+    s = ptr32(src)
+    t = ptr32(packed)
+    for i in range(lo, hi):
+        c = int(s[i])
+        d[i] = t[(c >> 16) & 0xFF] | t[256 + ((c >> 8) & 0xFF)] | t[512 + (c & 0xFF)]
+
+# Packed colour arithmetic. Each function operates on all three 8-bit channels of 0x00RRGGBB colour values at once and works equally on integers and NumPy uint32 arrays. The top byte of a and b must be zero.
+#
+# Adding the low 7 bits of each channel can't carry into the next channel; the top bit of each channel is then restored with an exclusive or. A channel overflowed if its top bit carried out, and overflowed channels are set to 0xFF.
+def _addSaturating(a, b):
+    s = ((a & 0x7F7F7F) + (b & 0x7F7F7F)) ^ ((a ^ b) & 0x808080)
+    carry = ((a & b) | ((a | b) & ~s)) & 0x808080
+    return s | ((carry >> 7) * 0xFF)
+
+# Setting the top bit of each channel of a before subtracting stops borrows crossing into the next channel. Channels which borrowed are set to 0.
+def _subSaturating(a, b):
+    d = ((a | 0x808080) - (b & 0x7F7F7F)) ^ ((a ^ ~b) & 0x808080)
+    borrow = ((~a & b) | (~(a ^ b) & d)) & 0x808080
+    return d & ~((borrow >> 7) * 0xFF) & 0xFFFFFF
+
+# Multiplies each channel by factor/256, for factor in [0,256]. Red and blue are 16 bits apart so they are scaled with a single multiply.
+def _scale(c, factor):
+    return ((((c & 0xFF00FF) * factor) >> 8) & 0xFF00FF) | ((((c & 0x00FF00) * factor) >> 8) & 0x00FF00)
+
+# Converts LEDs [lo, hi) of the frame buffer src by the packed output table using zero-copy NumPy views. Returns a new uint32 array of packed 0x00RRGGBB values.
+def _convertNumpy(src, packed, lo, hi):
+    c = numpy.frombuffer(src, dtype=numpy.uint32)[lo:hi]
+    t = numpy.frombuffer(packed, dtype=numpy.uint32)
+    return t[(c >> 16) & 0xFF] | t[256 + ((c >> 8) & 0xFF)] | t[512 + (c & 0xFF)]
+
+## @brief Output backend which splits a display's LEDs across several outputs, each driven by its own backend.
+#
+# Each segment's backend is constructed as backendClass(stop - start, pin, sm + k) for the k-th segment, and is passed the part of each frame which falls within its segment. On the Raspberry Pi Pico each segment therefore has its own PIO state machine and, when rp2.DMA is available, its own DMA channel: show() starts every segment's transfer and returns, so the segments are transmitted at the same time.
+#
+# Display constructors create this backend when given the segments argument, unless the backend class handles segments itself.
+
+class segmentedBackend():
+
+    ## @brief Initialisation routine for the segmented backend
+    #
+    # \param backendClass The backend class, or other callable, which drives each segment
+    # \param segments A list of (pin, start, stop) tuples. Segment k drives LEDs [start, stop) of the display from pin.
+    # \param sm The PIO state machine used by the first segment. Later segments use the following state machines.
+    def __init__(self, backendClass, segments, sm = 0):
+        ## A list of (start, stop, backend) tuples, one for each segment
+        self.segments = [(start, stop, backendClass(stop - start, pin, sm + k)) for k, (pin, start, stop) in enumerate(segments)]
+        # The frame buffer show() was last called with and a view of each segment's part of it
+        self._src = None
+        self._views = None
+
+    def show(self, src, lo, hi, table):
+        if src is not self._src:
+            mv = memoryview(src)
+            self._views = [mv[start:stop] for start, stop, _ in self.segments]
+            self._src = src
+        views = self._views
+        k = 0
+        for start, stop, backend in self.segments:
+            # Segments with no modified LEDs are left showing their previous frame
+            if lo < stop and hi > start:
+                backend.show(views[k], max(lo, start) - start, min(hi, stop) - start, table)
+            k += 1
+
+# Returns segments as a list of (pin, start, stop) tuples sorted by start, or None with a message if they are invalid
+def _parseSegments(segments, numLEDs):
+    parsed = []
+    try:
+        for segment in segments:
+            if len(segment) == 3:
+                pin, start, stop = segment
+            else:
+                pin, indices = segment
+                start = indices[0]
+                stop = indices[-1] + 1
+                if len(indices) != stop - start:
+                    raise ValueError
+            parsed.append((pin, int(start), int(stop)))
+    except (TypeError, ValueError, IndexError):
+        parsed = []
+    parsed.sort(key = lambda segment: segment[1])
+    valid = len(parsed) > 0
+    end = 0
+    for pin, start, stop in parsed:
+        if start < end or stop <= start or stop > numLEDs:
+            valid = False
+        end = stop
+    if not valid:
+        print("Invalid segments \"", segments, "\".")
+        print("Valid options: a list of (pin, range(start, stop)) or (pin, start, stop) tuples with non-overlapping, non-empty ranges of LEDs within [0,", numLEDs, ")")
+        print("Defaulting to a single output")
+        return None
+    return parsed
+
+# Output backends by name. "Hardware" is the backend for this platform's GlowBit hardware.
+_backends = {
+    "Null": nullBackend,
+    "Recording": recordingBackend,
+}
+if _SYSNAME == 'rp2':
+    _backends["Hardware"] = pioBackend
+else:
+    _backends["Hardware"] = ws281xBackend
+
+## @brief Adds an output backend which can be selected by name with the backend argument of GlowBit display constructors or the GLOWBIT_BACKEND environment variable.
+#
+# A backend is a class, or other callable, constructed as backendClass(numLEDs, pin, sm). It must have the method show(src, lo, hi, table) which transmits a frame: src is an array of numLEDs packed 0x00RRGGBB colours, of which LEDs [lo, hi) have changed since the previous frame. src may be a memoryview of part of a larger buffer. Each colour channel is converted to its output level by the 768 byte table, which folds in the brightness, gamma and white balance: red value r is output as table[r], green value g as table[256 + g] and blue value b as table[512 + b]. The table is replaced, rather than modified, when the settings change, so backends can cache data derived from it until they are passed a different table.
+#
+# When a display is split into segments each segment is driven by a separate instance of the backend, see segmentedBackend. A backend which drives several outputs itself, such as the Raspberry Pi hardware backend, instead sets the class attribute segmented = True and is constructed as backendClass(numLEDs, pin, sm, segments = segments) with segments a list of (pin, start, stop) tuples.
+#
+# \param name The name of the backend. Names are not case sensitive.
+# \param backendClass The backend class
+
+def registerBackend(name, backendClass):
+    _backends[name] = backendClass
+
+# Returns the backend class registered as name, ignoring case, or None
+def _findBackend(name):
+    for key in _backends:
+        if key.lower() == name.lower():
+            return _backends[key]
+    return None
+
+## @brief Low-level methods common to all GlowBit classes
+
+class glowbit(colourFunctions, colourMaps):
+    # Allocates the internal buffers and creates the output backend. Must be called by the constructor once numLEDs is set.
+    def _initOutput(self, pin, sm, backend, gcPolicy, segments = None):
+        self.ar = array.array("I", [0 for _ in range(self.numLEDs)])
+        # The range of LEDs [_dirtyMin, _dirtyMax) modified since the last call to pixelsShow()
+        self._dirtyMin = 0
+        self._dirtyMax = self.numLEDs
+        # Incremented whenever the whole buffer is overwritten, so graphs which draw incrementally know to redraw in full
+        self._clearCount = 0
+        # The brightness the last frame was drawn with, which may be reduced by the current limit, and the output table built for it
+        self._outBrightness = -1
+        self._outTable = None
+        self._gammaCurve = None
+        self._whiteBalance = [256, 256, 256]
+        self._currentLimit = 0
+        self._powerLUTBrightness = -1
+        # The brightness the current limit's per-pixel estimates were calculated at
+        self._currentBrightness = -1
+        # The buffer frames are output from. Without layers this is ar[], otherwise layers are composited into a separate buffer.
+        self._outAr = self.ar
+        self._layers = None
+        self._frameDeadline = _ticks_us()
+        self.resetFrameJitter()
+        self.updateGCPolicy(gcPolicy)
+        _importNumpy()
+
+        if backend is None:
+            getenv = getattr(os, "getenv", None)
+            if getenv is not None:
+                backend = getenv("GLOWBIT_BACKEND")
+            if not backend:
+                backend = "Hardware"
+        if callable(backend):
+            backendClass = backend
+        else:
+            backendClass = _findBackend(backend)
+            if backendClass is None:
+                print("Invalid backend \"", backend, "\".")
+                print("Valid options:", ", ".join(_backends))
+                print("Defaulting to Hardware")
+                backendClass = _backends["Hardware"]
+        if segments is not None:
+            segments = _parseSegments(segments, self.numLEDs)
+        ## The output backend which transmits frames shown by pixelsShow()
+        if segments is None:
+            self.backend = backendClass(self.numLEDs, pin, sm)
+        elif getattr(backendClass, "segmented", False):
+            self.backend = backendClass(self.numLEDs, pin, sm, segments = segments)
+        else:
+            self.backend = segmentedBackend(backendClass, segments, sm)
+        # Retained for compatibility; the PIO backend converts frames into this buffer
+        self.dimmer_ar = getattr(self.backend, "dimmer_ar", None)
+
+        if _SYSNAME == 'rp2':
+            self.pixelsShow = self._pixelsShowPico
+        else:
+            self.pixelsShow = self._pixelsShowLinux
+
+    def _pixelsShowPico(self, force = False):
+        if not self._frameChanged(force):
+            return
+        self._collectGarbage()
+        alloc = gc.mem_alloc()
         self.__syncWait()
-        gc.collect()
-        ar = self.dimmer_ar
-        br = int(self.brightness)
-        for i,c in enumerate(self.ar):
-            r = int((((int(c) >> 16) & 0xFF) * br) >> 8)
-            g = int((((int(c) >> 8) & 0xFF) * br) >> 8)
-            b = int(((int(c) & 0xFF) * br) >> 8)
-            ar[i] = (g<<16) | (r<<8) | b    
-            self.sm.put(ar[i], 8)
-
-    def _pixelsShowRPi(self):
+        self._pixelsUpdate()
+        # An automatic collection during the frame frees memory, which could make the difference negative
+        self._frameAlloc = max(0, gc.mem_alloc() - alloc)
+
+    def _pixelsShowLinux(self, force = False):
+        if not self._frameChanged(force):
+            return
         self.__syncWait()
-        br = self.brightness
-        for i,c in enumerate(self.ar):
-            r = int((((int(c) >> 16) & 0xFF) * br) >> 8)
-            g = int((((int(c) >> 8) & 0xFF) * br) >> 8)
-            b = int(((int(c) & 0xFF) * br) >> 8)
-            self.strip.setPixelColor(i, (r<<16) | (g<<8) | b)
-        self.strip.show()
+        self._pixelsUpdate()
+
+    # Transmits the modified LEDs without waiting for the frame rate limit
+    def _pixelsUpdate(self):
+        self.backend.show(self._outAr, self._dirtyMin, self._dirtyMax, self._outTable)
+        self._dirtyMin = self.numLEDs
+        self._dirtyMax = 0
    
+    # Blocks until the next frame's deadline. Deadlines are spaced exactly 1/rateLimit seconds apart so timing errors don't accumulate from frame to frame.
     def __syncWait(self):
-        while self.ticks_ms() < (self.lastFrame_ms + 1000 // self.rateLimit):
-            continue
-        self.lastFrame_ms = self.ticks_ms()
-    
-    def _ticks_ms_Linux(self):
-        return time.time()*1000
-          
+        deadline = self._frameDeadline
+        remaining = _ticks_diff(deadline, _ticks_us())
+        if remaining > _SPIN_US:
+            _sleep_us(remaining - _SPIN_US)
+        while _ticks_diff(deadline, _ticks_us()) > 0:
+            pass
+        self._frameStarted(deadline, remaining)
+
+    # The asyncio equivalent of __syncWait(). Other tasks run while waiting for the deadline.
+    async def _syncWaitAsync(self):
+        deadline = self._frameDeadline
+        remaining = _ticks_diff(deadline, _ticks_us())
+        if remaining > 0:
+            await _asyncio().sleep(remaining / 1000000)
+        # The event loop's timer resolution may wake this task slightly early
+        while _ticks_diff(deadline, _ticks_us()) > 0:
+            pass
+        self._frameStarted(deadline, remaining)
+
+    # Records jitter statistics and schedules the frame after deadline. remaining is the time, in microseconds, the frame had to wait.
+    def _frameStarted(self, deadline, remaining):
+        period = self._framePeriod
+        now = _ticks_us()
+        late = _ticks_diff(now, deadline)
+        if remaining > 0:
+            # Only frames which had to wait measure the limiter's jitter
+            self._jitterLast = late
+            # The moving average is kept scaled by 16 so the shift doesn't discard small differences
+            self._jitterAcc += late - (self._jitterAcc >> 4)
+            if late > self._jitterMax:
+                self._jitterMax = late
+        if late > period:
+            # More than a whole frame behind; start afresh rather than rushing to catch up
+            self._frameDeadline = _ticks_add(now, period)
+        else:
+            self._frameDeadline = _ticks_add(deadline, period)
+
+    ## @brief The asyncio coroutine equivalent of pixelsShow().
+    #
+    # Instead of blocking to enforce the frame rate limit this coroutine awaits the next frame's deadline, allowing other tasks to run. Compatible with CPython asyncio and MicroPython uasyncio.
+    #
+    # \param force If True every LED is updated, even if it hasn't been modified.
+    async def pixelsShowAsync(self, force = False):
+        if getattr(self, "_txThread", None) is not None:
+            # The transmit thread already paces frames; pixelsShow() only queues the frame
+            self.pixelsShow(force)
+            return
+        if not self._frameChanged(force):
+            return
+        layered = self._layers is not None
+        if layered:
+            # Other tasks may draw to the layers while this task waits. Keep the composited range aside so those draws are recorded separately.
+            lo = self._dirtyMin
+            hi = self._dirtyMax
+            self._dirtyMin = self.numLEDs
+            self._dirtyMax = 0
+        await self._syncWaitAsync()
+        if _SYSNAME == 'rp2':
+            self._collectGarbage()
+            # Measured after the wait, so allocations by other tasks while waiting aren't counted
+            alloc = gc.mem_alloc()
+        if layered:
+            self._composite(False)
+            if self._currentLimit > 0 and self._dirtyMin < self._dirtyMax:
+                self._currentTotal = self._updatePixelCurrent(self._dirtyMin, self._dirtyMax, self._currentTotal)
+            self._dirtyMin = min(self._dirtyMin, lo)
+            self._dirtyMax = max(self._dirtyMax, hi)
+        self._pixelsUpdate()
+        if _SYSNAME == 'rp2':
+            self._frameAlloc = max(0, gc.mem_alloc() - alloc)
+
+    ## @brief (Raspberry Pi only) Starts a background thread which transmits frames to the physical LEDs.
+    #
+    # While the thread is running pixelsShow() copies the internal buffer into a queue of frames and returns immediately. The thread applies the frame rate limit, converts each frame and sends it to the LEDs, so drawing the next frame can overlap with transmitting the previous one.
+    #
+    # \param depth The number of frames which can be queued waiting for transmission. Buffers for these frames are allocated once, when the thread starts.
+    # \param policy What pixelsShow() does when the queue is full. One of "DropOldest" (discard the oldest queued frame), "DropNewest" (discard the new frame; its changes are sent with the next frame which is queued) or "Block" (wait for space in the queue).
+    def startTransmitThread(self, depth = 2, policy = "DropOldest"):
+        if _SYSNAME != 'Linux':
+            print("startTransmitThread() is only supported on the Raspberry Pi")
+            return
+        if policy not in ("DropOldest", "DropNewest", "Block"):
+            print("Invalid policy \"", policy, "\".")
+            print("Valid options: DropOldest, DropNewest, Block")
+            print("Defaulting to DropOldest")
+            policy = "DropOldest"
+        import threading
+        self.stopTransmitThread()
+        if depth < 1:
+            depth = 1
+        self._txDepth = depth
+        self._txPolicy = policy
+        # One more buffer than the queue depth; the spare is owned by the thread while it transmits a frame
+        self._txFrames = [array.array("I", [0 for _ in range(self.numLEDs)]) for _ in range(depth)]
+        self._txSpare = array.array("I", [0 for _ in range(self.numLEDs)])
+        self._txMin = [0 for _ in range(depth)]
+        self._txMax = [0 for _ in range(depth)]
+        self._txTables = [None for _ in range(depth)]
+        self._txHead = 0
+        self._txCount = 0
+        self._txRunning = True
+        self._txCond = threading.Condition()
+        self._txThread = threading.Thread(target = self._transmitLoop, daemon = True)
+        self._txThread.start()
+        self.pixelsShow = self._pixelsShowThreaded
+
+    ## @brief Stops the thread started by startTransmitThread(). Frames which are already queued are transmitted before this method returns.
+    def stopTransmitThread(self):
+        if getattr(self, "_txThread", None) is None:
+            return
+        with self._txCond:
+            self._txRunning = False
+            self._txCond.notify_all()
+        self._txThread.join()
+        self._txThread = None
+        self.pixelsShow = self._pixelsShowLinux
+
+    def _pixelsShowThreaded(self, force = False):
+        if not self._frameChanged(force):
+            return
+        cond = self._txCond
+        depth = self._txDepth
+        with cond:
+            if self._txCount == depth:
+                if self._txPolicy == "DropNewest":
+                    # Leave the dirty range set so these changes are included in the next queued frame
+                    return
+                elif self._txPolicy == "Block":
+                    while self._txCount == depth:
+                        cond.wait()
+                else:
+                    # Drop the oldest frame. Its changes must be carried by the frame now at the head of the queue.
+                    head = self._txHead
+                    lo = self._txMin[head]
+                    hi = self._txMax[head]
+                    self._txHead = (head + 1) % depth
+                    self._txCount -= 1
+                    if self._txCount > 0:
+                        head = self._txHead
+                        self._txMin[head] = min(lo, self._txMin[head])
+                        self._txMax[head] = max(hi, self._txMax[head])
+                    else:
+                        self._dirtyMin = min(lo, self._dirtyMin)
+                        self._dirtyMax = max(hi, self._dirtyMax)
+            slot = (self._txHead + self._txCount) % depth
+            self._txFrames[slot][:] = self._outAr
+            self._txMin[slot] = self._dirtyMin
+            self._txMax[slot] = self._dirtyMax
+            self._txTables[slot] = self._outTable
+            self._txCount += 1
+            cond.notify_all()
+        self._dirtyMin = self.numLEDs
+        self._dirtyMax = 0
+
+    def _transmitLoop(self):
+        cond = self._txCond
+        while True:
+            with cond:
+                while self._txCount == 0 and self._txRunning:
+                    cond.wait()
+                if self._txCount == 0:
+                    return
+                # Swap the queued buffer with the spare so pixelsShow() can refill the slot while this frame is sent
+                head = self._txHead
+                frame = self._txFrames[head]
+                self._txFrames[head] = self._txSpare
+                self._txSpare = frame
+                lo = self._txMin[head]
+                hi = self._txMax[head]
+                table = self._txTables[head]
+                self._txHead = (head + 1) % self._txDepth
+                self._txCount -= 1
+                cond.notify_all()
+            self.__syncWait()
+            self.backend.show(frame, lo, hi, table)
+
+    ## @brief (Raspberry Pi Pico only) Sets when pixelsShow() runs the garbage collector.
+    #
+    # Collecting garbage takes several milliseconds once the heap is populated. Tying collections to frames avoids them happening at a random point mid-animation, but collecting every frame may limit the frame rate.
+    #
+    # \param policy One of "EveryFrame", "EveryNFrames" (collect once every value frames), "Threshold" (collect when less than value bytes of heap are free) or "Never" (leave garbage collection to MicroPython).
+    # \param value The number of frames for "EveryNFrames" (default 10) or the free heap size in bytes for "Threshold" (default 16384). Ignored by other policies.
+    def updateGCPolicy(self, policy, value = None):
+        if policy not in ("EveryFrame", "EveryNFrames", "Threshold", "Never"):
+            print("Invalid GC policy \"", policy, "\".")
+            print("Valid options: EveryFrame, EveryNFrames, Threshold, Never")
+            print("Defaulting to EveryFrame")
+            policy = "EveryFrame"
+        if value is None:
+            if policy == "EveryNFrames":
+                value = 10
+            else:
+                value = 16384
+        self._gcPolicy = policy
+        self._gcValue = int(value)
+        self._gcCount = 0
+        self._frameAlloc = 0
+
+    def _collectGarbage(self):
+        policy = self._gcPolicy
+        if policy == "EveryFrame":
+            gc.collect()
+        elif policy == "EveryNFrames":
+            self._gcCount += 1
+            if self._gcCount >= self._gcValue:
+                self._gcCount = 0
+                gc.collect()
+        elif policy == "Threshold":
+            if gc.mem_free() < self._gcValue:
+                gc.collect()
+
+    ## @brief (Raspberry Pi Pico only) Returns the number of bytes of heap allocated during the most recent call to pixelsShow() or pixelsShowAsync().
+    #
+    # Garbage collection done according to the GC policy is excluded, as is the time pixelsShowAsync() spends waiting for the frame deadline while other tasks run. A steady-state frame should allocate zero bytes.
+    #
+    # The value is approximate: it is the change in allocated heap across the frame, so memory freed by an automatic garbage collection during the frame is subtracted from it. It is never negative.
+    def getFrameAllocBytes(self):
+        return self._frameAlloc
+
+    ## @brief Returns statistics on the timing accuracy of the frame rate limiter.
+    #
+    # Jitter is the time between a frame's scheduled start and the moment pixelsShow() actually began updating the LEDs. It is only measured for frames where pixelsShow() had to wait for the rate limit.
+    #
+    # \return A tuple (last, average, maximum) of jitter values in microseconds. The average is a moving average over approximately the last 16 frames.
+    def getFrameJitter(self):
+        return (self._jitterLast, self._jitterAcc >> 4, self._jitterMax)
+
+    ## @brief Resets the statistics returned by getFrameJitter()
+    def resetFrameJitter(self):
+        self._jitterLast = 0
+        self._jitterAcc = 0
+        self._jitterMax = 0
+
+
+    # Returns True if any LEDs have been modified since the last frame was shown. If force is True every LED is marked as modified.
+    #
+    # Also sets _outBrightness, the brightness frames are converted with, and rebuilds the output table _outTable if the brightness or colour correction has changed. Every LED is then marked as modified.
+    def _frameChanged(self, force):
+        if self._layers is not None:
+            self._composite(force)
+        if force or self._dirtyMin < 0:
+            self._dirtyMin = 0
+            self._dirtyMax = self.numLEDs
+        elif self._dirtyMax > self.numLEDs:
+            self._dirtyMax = self.numLEDs
+        br = self.brightness
+        if self._currentLimit > 0:
+            br = self._limitCurrent()
+        if br != self._outBrightness or self._outTable is None:
+            self._outBrightness = br
+            self._outTable = _buildOutputTable(br, self._gammaCurve, self._whiteBalance)
+            self._dirtyMin = 0
+            self._dirtyMax = self.numLEDs
+        return self._dirtyMin < self._dirtyMax
 
     ## @brief Pushes the internal pixel data buffer to the physical GlowBit LEDs
     # 
     # This function must be called before the connected GlowBit LEDs will change colour.
     # 
     # Note that several GlowBit library methods call this method unconditionally (eg: glowbit.blankDisplay ) or optionally (eg: by passing the update = True parameter to stick.graph1D() )
-    def pixelsShow(self):
+    #
+    # Only LEDs modified since the previous call are converted and, if no LEDs were modified, this method returns immediately. If the internal buffer ar[] has been modified directly either call markDirty() first or pass force = True.
+    #
+    # \param force If True every LED is updated, even if it hasn't been modified.
+    def pixelsShow(self, force = False):
         return
 
+    ## @brief A layer of the display. Created by addLayer().
+    #
+    # Each layer has its own buffer ar[] of 32-bit GlowBit colour values. Layers are combined, from lowest z to highest, into the frame shown by pixelsShow().
+
+    class layer():
+        def __init__(self, ar, z, blend, key):
+            ## The layer's buffer of 32-bit GlowBit colour values
+            self.ar = ar
+            ## The layer's position in the stack. Layers with a higher z are drawn over layers with a lower z.
+            self.z = z
+            ## How the layer is combined with the layers below it; see addLayer()
+            self.blend = blend
+            ## The transparent colour of a "Key" layer
+            self.key = key
+            # The range of LEDs [_dirtyMin, _dirtyMax) modified since the layer was last composited
+            self._dirtyMin = 0
+            self._dirtyMax = len(ar)
+
+    ## @brief Adds a layer to the display.
+    #
+    # Each layer has its own buffer. Drawing methods draw to the layer chosen with selectLayer(). When pixelsShow() is called the layers are combined, from the lowest z to the highest, into the frame sent to the LEDs. Only LEDs modified in some layer since the previous frame are recombined, so layers which don't change cost nothing per frame.
+    #
+    # The display's original buffer becomes the base layer, with z = 0 and the "Replace" blend, the first time this method is called.
+    #
+    # \param z The layer's position in the stack. Defaults to one above the current top layer.
+    # \param blend How the layer is combined with the layers below it. One of "Replace" (the layer's pixels replace those below), "Add" (the layer's pixels are added to those below, saturating at 255 per colour channel) or "Key" (the layer's pixels replace those below, except pixels of the key colour which are transparent).
+    # \param key The transparent colour of a "Key" layer. Defaults to black.
+    # \return The new layer object. Pass it to selectLayer() to draw to it.
+    def addLayer(self, z = None, blend = "Key", key = 0x000000):
+        blend = self._checkBlend(blend)
+        if self._layers is None:
+            base = self.layer(self.ar, 0, "Replace", 0)
+            self._layers = [base]
+            self._baseLayer = base
+            self._layer = base
+            self._outAr = array.array("I", self.ar)
+            # LEDs which must be recomposited because the layer stack itself changed
+            self._restackMin = 0
+            self._restackMax = self.numLEDs
+        if z is None:
+            z = self._layers[-1].z + 1
+        newLayer = self.layer(array.array("I", [key if blend == "Key" else 0 for _ in range(self.numLEDs)]), z, blend, key)
+        self._layers.append(newLayer)
+        self._sortLayers()
+        return newLayer
+
+    ## @brief Chooses the layer drawing methods draw to.
+    #
+    # \param layer A layer returned by addLayer() or None for the base layer.
+    def selectLayer(self, layer = None):
+        if self._layers is None:
+            return
+        if layer is None:
+            layer = self._baseLayer
+        # The dirty range of the selected layer is tracked in _dirtyMin/_dirtyMax by the drawing methods
+        current = self._layer
+        current._dirtyMin = self._dirtyMin
+        current._dirtyMax = self._dirtyMax
+        self._layer = layer
+        self.ar = layer.ar
+        self._dirtyMin = layer._dirtyMin
+        self._dirtyMax = layer._dirtyMax
+
+    ## @brief Changes the position, blend or key colour of a layer.
+    #
+    # \param layer A layer returned by addLayer()
+    # \param z The layer's new position in the stack. None leaves it unchanged.
+    # \param blend The layer's new blend; see addLayer(). None leaves it unchanged.
+    # \param key The layer's new key colour. None leaves it unchanged.
+    def updateLayer(self, layer, z = None, blend = None, key = None):
+        if z is not None:
+            layer.z = z
+        if blend is not None:
+            layer.blend = self._checkBlend(blend)
+        if key is not None:
+            layer.key = key
+        self._sortLayers()
+        self._restackMin = 0
+        self._restackMax = self.numLEDs
+
+    ## @brief Removes a layer added by addLayer(). The base layer can't be removed.
+    #
+    # If the removed layer was selected the base layer is selected.
+    #
+    # \param layer A layer returned by addLayer()
+    def removeLayer(self, layer):
+        if self._layers is None or layer is self._baseLayer or layer not in self._layers:
+            return
+        if layer is self._layer:
+            self.selectLayer()
+        self._layers.remove(layer)
+        self._restackMin = 0
+        self._restackMax = self.numLEDs
+
+    def _checkBlend(self, blend):
+        if blend not in ("Replace", "Add", "Key"):
+            print("Invalid blend \"", blend, "\".")
+            print("Valid options: Replace, Add, Key")
+            print("Defaulting to Key")
+            blend = "Key"
+        return blend
+
+    def _sortLayers(self):
+        self._layers.sort(key = lambda l: l.z)
+
+    # Recombines the layers over the LEDs modified in any layer since the last frame, and sets the dirty range to those LEDs so they are output by pixelsShow().
+    def _composite(self, force):
+        current = self._layer
+        lo = min(self._restackMin, self._dirtyMin, current._dirtyMin)
+        hi = max(self._restackMax, self._dirtyMax, current._dirtyMax)
+        if force:
+            lo = 0
+            hi = self.numLEDs
+        numLEDs = self.numLEDs
+        for l in self._layers:
+            if l._dirtyMin < lo:
+                lo = l._dirtyMin
+            if l._dirtyMax > hi:
+                hi = l._dirtyMax
+            l._dirtyMin = numLEDs
+            l._dirtyMax = 0
+        self._restackMin = numLEDs
+        self._restackMax = 0
+        if lo < 0:
+            lo = 0
+        if hi > numLEDs:
+            hi = numLEDs
+        if lo < hi:
+            for l in self._layers:
+                self._blendLayer(l, lo, hi)
+        self._dirtyMin = lo
+        self._dirtyMax = hi
+
+    # Combines LEDs [lo, hi) of a layer into the output buffer
+    def _blendLayer(self, layer, lo, hi):
+        out = self._outAr
+        blend = layer.blend
+        if numpy is not None:
+            o = numpy.frombuffer(out, dtype=numpy.uint32)[lo:hi]
+            src = numpy.frombuffer(layer.ar, dtype=numpy.uint32)[lo:hi]
+            if blend == "Replace":
+                o[:] = src
+            elif blend == "Add":
+                o[:] = _addSaturating(o & 0xFFFFFF, src & 0xFFFFFF)
+            else:
+                o[:] = numpy.where(src == layer.key, o, src)
+        elif blend == "Replace":
+            if _SYSNAME == 'rp2':
+                self._blendRange(out, layer.ar, lo, hi, 0, 0)
+            else:
+                out[lo:hi] = layer.ar[lo:hi]
+        elif blend == "Add":
+            self._blendRange(out, layer.ar, lo, hi, 1, 0)
+        else:
+            self._blendRange(out, layer.ar, lo, hi, 2, layer.key)
+
+    # Combines LEDs [lo, hi) of src into out. mode is 0 for "Replace", 1 for "Add" and 2 for "Key"
+    @micropython.viper
+    def _blendRange(self, out, src, lo: int, hi: int, mode: int, key: int):
+        o = ptr32(out)
+        s = ptr32(src)
+        if mode == 0:
+            for i in range(lo, hi):
+                o[i] = s[i]
+        elif mode == 1:
+            for i in range(lo, hi):
+                a = o[i] & 0xFFFFFF
+                b = s[i] & 0xFFFFFF
+                # See _addSaturating()
+                t = ((a & 0x7F7F7F) + (b & 0x7F7F7F)) ^ ((a ^ b) & 0x808080)
+                carry = ((a & b) | ((a | b) & ~t)) & 0x808080
+                o[i] = t | ((carry >> 7) * 0xFF)
+        else:
+            for i in range(lo, hi):
+                c = s[i]
+                if c != key:
+                    o[i] = c
+
+    ## @brief Marks a range of LEDs as modified so that the next call to pixelsShow() updates them.
+    #
+    # All GlowBit library drawing methods do this automatically. It is only required after modifying the internal buffer ar[] directly.
+    #
+    # \param i The index of the first modified LED
+    # \param j One more than the index of the last modified LED. A value of -1 marks every LED from i to the end of the display.
+    def markDirty(self, i = 0, j = -1):
+        if j == -1:
+            j = self.numLEDs
+        if i < self._dirtyMin:
+            self._dirtyMin = i
+        if j > self._dirtyMax:
+            self._dirtyMax = j
+
     ## @brief Sets the i'th GlowBit LED to a 32-bit GlowBit colour value.
     # 
     # NB: For efficiency, this method does not do any bounds checking. If the value of the parameter i is larger than the number of LEDs it will cause an IndexError exception.
@@ -216,6 +1253,10 @@ class glowbit(colourFunctions, colourMaps):
     @micropython.viper
     def pixelSet(self, i: int, colour: int):
         self.ar[i] = colour
+        if i < int(self._dirtyMin):
+            self._dirtyMin = i
+        if i >= int(self._dirtyMax):
+            self._dirtyMax = i + 1
     
     ## @brief Sets the i'th GlowBit LED to a 32-bit GlowBit colour value and updates the physical LEDs.
     # 
@@ -227,6 +1268,10 @@ class glowbit(colourFunctions, colourMaps):
     @micropython.viper
     def pixelSetNow(self, i: int, colour: int):
         self.ar[i] = colour
+        if i < int(self._dirtyMin):
+            self._dirtyMin = i
+        if i >= int(self._dirtyMax):
+            self._dirtyMax = i + 1
         self.pixelsShow()
         
     ## @brief Adds a 32-bit GlowBit colour value to the i'th LED in the internal buffer only.
@@ -243,8 +1288,12 @@ class glowbit(colourFunctions, colourMaps):
     def pixelAdd(self, i: int, colour: int):
         tmp = int(self.ar[i]) + colour
         self.ar[i] = tmp
+        if i < int(self._dirtyMin):
+            self._dirtyMin = i
+        if i >= int(self._dirtyMax):
+            self._dirtyMax = i + 1
  
-    ## @brief Adds a 32-bit GlowBit colour value to the i'th LED in the internal buffer. This function performs "saturating" arithmetic. It is much slower than pixelAdd but will saturate at 255 to avoid data corruption.
+    ## @brief Adds a 32-bit GlowBit colour value to the i'th LED in the internal buffer. This function performs "saturating" arithmetic. It is slower than pixelAdd but will saturate at 255 to avoid data corruption.
     #
     # NB: For efficiency, this method does not do any index bounds checking. If the value of the parameter i is larger than the number of LEDs it will cause an IndexError exception.
     #
@@ -254,27 +1303,124 @@ class glowbit(colourFunctions, colourMaps):
 
     @micropython.viper
     def pixelSaturatingAdd(self, i: int, colour: int):
-        tmp = int(self.ar[i])
-        r = (colour & 0xFF0000) >> 16
-        g = (colour & 0x00FF00) >> 8
-        b = (colour & 0x0000FF)
-        
-        r2 = (tmp & 0xFF0000) >> 16
-        g2 = (tmp & 0x00FF00) >> 8
-        b2 = (tmp & 0x0000FF)
-
-        r3 = r + r2
-        g3 = g + g2
-        b3 = b + b2
-
-        if r3 > 255:
-            r3 = 255
-        if g3 > 255:
-            g3 = 255
-        if b3 > 255:
-            b3 = 255
-
-        self.ar[i] = (r3 << 16) + (g3 << 8) + b3
+        a = int(self.ar[i]) & 0xFFFFFF
+        b = colour & 0xFFFFFF
+        # All three channels are added at once; see _addSaturating()
+        s = ((a & 0x7F7F7F) + (b & 0x7F7F7F)) ^ ((a ^ b) & 0x808080)
+        carry = ((a & b) | ((a | b) & ~s)) & 0x808080
+        self.ar[i] = s | ((carry >> 7) * 0xFF)
+        if i < int(self._dirtyMin):
+            self._dirtyMin = i
+        if i >= int(self._dirtyMax):
+            self._dirtyMax = i + 1
+
+    ## @brief Adds another buffer of 32-bit GlowBit colour values to the internal buffer with "saturating" arithmetic. Each colour channel saturates at 255, giving the same result as calling pixelSaturatingAdd() for every LED.
+    #
+    # All three colour channels of a pixel are processed at once with packed integer arithmetic. On the Raspberry Pi the operation is vectorised with NumPy when it is installed.
+    #
+    # \param other An array.array("I") of numLEDs 32-bit GlowBit colour values, eg: the ar[] buffer of another display object of the same size. If other is shorter than the internal buffer only its first len(other) LEDs are changed.
+
+    def bufferAddSaturating(self, other):
+        n = min(self.numLEDs, len(other))
+        if numpy is not None:
+            a = numpy.frombuffer(self.ar, dtype=numpy.uint32)[:n]
+            a[:] = _addSaturating(a & 0xFFFFFF, numpy.frombuffer(other, dtype=numpy.uint32)[:n] & 0xFFFFFF)
+        else:
+            self._bufferAddSaturating(other, n)
+        self._markBuffer(n)
+
+    ## @brief Subtracts another buffer of 32-bit GlowBit colour values from the internal buffer with "saturating" arithmetic. Each colour channel stops at 0 rather than wrapping around.
+    #
+    # \param other An array.array("I") of numLEDs 32-bit GlowBit colour values, eg: the ar[] buffer of another display object of the same size. If other is shorter than the internal buffer only its first len(other) LEDs are changed.
+
+    def bufferSubSaturating(self, other):
+        n = min(self.numLEDs, len(other))
+        if numpy is not None:
+            a = numpy.frombuffer(self.ar, dtype=numpy.uint32)[:n]
+            a[:] = _subSaturating(a & 0xFFFFFF, numpy.frombuffer(other, dtype=numpy.uint32)[:n] & 0xFFFFFF)
+        else:
+            self._bufferSubSaturating(other, n)
+        self._markBuffer(n)
+
+    ## @brief Sets each colour channel of every LED in the internal buffer to the larger of its current value and the value in another buffer.
+    #
+    # \param other An array.array("I") of numLEDs 32-bit GlowBit colour values, eg: the ar[] buffer of another display object of the same size. If other is shorter than the internal buffer only its first len(other) LEDs are changed.
+
+    def bufferMax(self, other):
+        n = min(self.numLEDs, len(other))
+        if numpy is not None:
+            a = numpy.frombuffer(self.ar, dtype=numpy.uint32)[:n] & 0xFFFFFF
+            b = numpy.frombuffer(other, dtype=numpy.uint32)[:n] & 0xFFFFFF
+            # max(a, b) = b + max(a - b, 0) for each channel, which never carries between channels
+            numpy.frombuffer(self.ar, dtype=numpy.uint32)[:n] = b + _subSaturating(a, b)
+        else:
+            self._bufferMax(other, n)
+        self._markBuffer(n)
+
+    # Marks LEDs [0, n) as modified
+    def _markBuffer(self, n):
+        if n > 0:
+            self._dirtyMin = 0
+            if n > self._dirtyMax:
+                self._dirtyMax = n
+
+    ## @brief Scales every colour channel of every LED in the internal buffer, eg: to fade the display.
+    #
+    # \param factor The scale factor. If factor is an integer it should be in the range [0,256], where 256 leaves the buffer unchanged. If factor is floating point it is assumed to be in the range [0,1.0].
+
+    def bufferScale(self, factor):
+        if isinstance(factor, float):
+            factor = int(factor*256)
+        factor = max(0, min(256, int(factor)))
+        if numpy is not None:
+            a = numpy.frombuffer(self.ar, dtype=numpy.uint32)
+            a[:] = _scale(a, factor)
+        else:
+            self._bufferScale(factor)
+        self._dirtyMin = 0
+        self._dirtyMax = self.numLEDs
+
+    # The viper equivalents of the NumPy paths above. Each inlines the corresponding module level function, eg: _addSaturating().
+
+    @micropython.viper
+    def _bufferAddSaturating(self, other, n: int):
+        ar = ptr32(self.ar)
+        src = ptr32(other)
+        for i in range(n):
+            a = ar[i] & 0xFFFFFF
+            b = src[i] & 0xFFFFFF
+            s = ((a & 0x7F7F7F) + (b & 0x7F7F7F)) ^ ((a ^ b) & 0x808080)
+            carry = ((a & b) | ((a | b) & ~s)) & 0x808080
+            ar[i] = s | ((carry >> 7) * 0xFF)
+
+    @micropython.viper
+    def _bufferSubSaturating(self, other, n: int):
+        ar = ptr32(self.ar)
+        src = ptr32(other)
+        for i in range(n):
+            a = ar[i] & 0xFFFFFF
+            b = src[i] & 0xFFFFFF
+            d = ((a | 0x808080) - (b & 0x7F7F7F)) ^ ((a ^ ~b) & 0x808080)
+            borrow = ((~a & b) | (~(a ^ b) & d)) & 0x808080
+            ar[i] = d & ~((borrow >> 7) * 0xFF) & 0xFFFFFF
+
+    @micropython.viper
+    def _bufferMax(self, other, n: int):
+        ar = ptr32(self.ar)
+        src = ptr32(other)
+        for i in range(n):
+            a = ar[i] & 0xFFFFFF
+            b = src[i] & 0xFFFFFF
+            d = ((a | 0x808080) - (b & 0x7F7F7F)) ^ ((a ^ ~b) & 0x808080)
+            borrow = ((~a & b) | (~(a ^ b) & d)) & 0x808080
+            ar[i] = b + (d & ~((borrow >> 7) * 0xFF) & 0xFFFFFF)
+
+    @micropython.viper
+    def _bufferScale(self, factor: int):
+        ar = ptr32(self.ar)
+        for i in range(int(self.numLEDs)):
+            c = ar[i]
+            ar[i] = ((((c & 0xFF00FF) * factor) >> 8) & 0xFF00FF) | ((((c & 0x00FF00) * factor) >> 8) & 0x00FF00)
            
     ## @brief Fills all pixels with a solid colour value
     #
@@ -285,6 +1431,9 @@ class glowbit(colourFunctions, colourMaps):
         ar = self.ar
         for i in range(int(len(self.ar))):
             ar[i] = colour
+        self._dirtyMin = 0
+        self._dirtyMax = self.numLEDs
+        self._clearCount = int(self._clearCount) + 1
             
     ## @brief Fills all pixels with a solid colour value and updates the physical LEDs.
     #
@@ -295,6 +1444,9 @@ class glowbit(colourFunctions, colourMaps):
         ar = ptr32(self.ar)
         for i in range(int(len(self.ar))):
             ar[i] = colour
+        self._dirtyMin = 0
+        self._dirtyMax = self.numLEDs
+        self._clearCount = int(self._clearCount) + 1
         self.pixelsShow()
         
     ## @brief Blanks the entire GlowBit display. ie: sets the colour value of all GlowBit LEDs to zero in the internal buffer and updates the physical LEDs.
@@ -306,9 +1458,35 @@ class glowbit(colourFunctions, colourMaps):
         ar = self.ar
         for i in range(int(len(self.ar))):
             ar[i] = 0
+        self._dirtyMin = 0
+        self._dirtyMax = self.numLEDs
+        self._clearCount = int(self._clearCount) + 1
         self.pixelsShow()
   
 
+    # Draws a graph1D bar with level pixels lit. Only the pixels between the previously drawn level and the new level are written unless the graph must be redrawn in full: when force is True, it was last drawn to a different buffer, the buffer has been cleared since, or its colours have changed.
+    def _drawGraph1D(self, graph, level, force):
+        if graph.colour != graph._cachedColour or graph.colourMap is not graph._cachedMap:
+            graph._cacheColours()
+            force = True
+        if graph._ar is not self.ar or graph._clearCount != self._clearCount:
+            force = True
+        old = graph._level
+        idx = graph._indices
+        colours = graph._colours
+        if force or old < 0:
+            for n in range(len(idx)):
+                self.pixelSet(idx[n], colours[n] if n < level else 0)
+        elif level > old:
+            for n in range(old, level):
+                self.pixelSet(idx[n], colours[n])
+        else:
+            for n in range(level, old):
+                self.pixelSet(idx[n], 0)
+        graph._level = level
+        graph._ar = self.ar
+        graph._clearCount = self._clearCount
+
     ## @brief Returns the 32-bit GlowBit colour value of the i'th LED
     #
     # \param i The index of the LED
@@ -323,6 +1501,17 @@ class glowbit(colourFunctions, colourMaps):
 
     def updateRateLimitFPS(self, rateLimitFPS):
         self.rateLimit = rateLimitFPS
+
+    ## @brief The frame rate limit in frames per second. May be fractional.
+    @property
+    def rateLimit(self):
+        return self._rateLimit
+
+    @rateLimit.setter
+    def rateLimit(self, rateLimit):
+        self._rateLimit = rateLimit
+        # The whole number of microseconds between frame deadlines, so the limiter does no floating point arithmetic per frame
+        self._framePeriod = int(1000000 // rateLimit)
         
     ## @brief Set a new brightness value
     #
@@ -333,6 +1522,32 @@ class glowbit(colourFunctions, colourMaps):
         else:
             self.brightness = int(brightness)
 
+    ## @brief Sets the gamma correction applied to colours as they are sent to the LEDs.
+    #
+    # LED brightness is proportional to the value sent, but perceived brightness is not: a gamma of around 2.2 to 2.8 makes colour fades look even. Gamma correction, white balance and brightness are combined into one table per colour channel, so enabling them adds no time to each frame.
+    #
+    # \param gamma The gamma exponent. Each colour channel value v in [0,255] is output as 255*(v/255)**gamma before brightness scaling. A gamma of 1.0 disables gamma correction.
+    def updateGamma(self, gamma = 1.0):
+        if gamma == 1.0:
+            self._gammaCurve = None
+        else:
+            self._gammaCurve = bytearray([int(255*((v/255)**gamma) + 0.5) for v in range(256)])
+        self._outTable = None
+
+    ## @brief Sets per-channel gains to correct the white balance of the LEDs, eg: to remove a blue tint from white.
+    #
+    # \param red The gain of the red channel. Floating point values are in the range [0,1.0] and integers in the range [0,256], where 256 is a gain of 1.
+    # \param green The gain of the green channel
+    # \param blue The gain of the blue channel
+    def updateWhiteBalance(self, red = 1.0, green = 1.0, blue = 1.0):
+        gains = []
+        for gain in (red, green, blue):
+            if isinstance(gain, float):
+                gain = int(gain*256)
+            gains.append(max(0, min(256, int(gain))))
+        self._whiteBalance = gains
+        self._outTable = None
+
     ## @brief Calculates an estimate for the total power draw given the current display data. Use as a general guide only, error range is around 10-20%.
     #
     # The estimate is a 4th order polynomical interpolation given measurements of white brightness. The power consumption of pure colours will tend to be under-estimated by up to about 10-20%.
@@ -341,12 +1556,78 @@ class glowbit(colourFunctions, colourMaps):
     #
     # \return The current consumption of the framebuffer in amps.
     def power(self):
+        if self._powerLUTBrightness != self.brightness:
+            self._buildPowerLUT()
+        lut = self._powerLUT
         p = 0
-        for i in range(self.numLEDs):
-            (r,g,b) = self.glowbitColour2RGB(self.ar[i])
-            x = (r+g+b)*self.brightness/255
-            p += (6.74277e-14*x**4)- (1.25707e-10*x**3) + (8.07761e-8*x**2) + (2.30660e-5*x) + 4.61474e-4
-        return p
+        for c in self._outAr:
+            p += lut[((c >> 16) & 0xFF) + ((c >> 8) & 0xFF) + (c & 0xFF)]
+        return (p + self._idleCurrent())/1000000
+
+    ## @brief Limits the estimated supply current of the display.
+    #
+    # On each call to pixelsShow() the current drawn by the frame is estimated as per power(). If the estimate exceeds the limit the frame is drawn with the brightness reduced so that the estimate is within the limit. The brightness set with updateBrightness() is restored once the frame's estimate is within the limit again.
+    #
+    # The estimate is kept up to date as pixels change so the limit adds little time to each frame. Use as a general guide only, see power() for the accuracy of the estimate.
+    #
+    # \param amps The maximum supply current in amps. A value of 0 disables the limit.
+    def updateCurrentLimit(self, amps):
+        self._currentLimit = int(amps*1000000)
+        if self._currentLimit > 0:
+            self._pixelCurrent = array.array("H", [0 for _ in range(self.numLEDs)])
+            self._currentTotal = 0
+            # Force the estimate to be rebuilt for every pixel
+            self._currentBrightness = -1
+        else:
+            self._pixelCurrent = None
+
+    # Builds a table of the current, in microamps, drawn by one LED at the present brightness indexed by the sum of its red, green and blue values [0,765]. The LED's idle current is excluded.
+    def _buildPowerLUT(self):
+        br = self.brightness
+        lut = array.array("I", [0 for _ in range(766)])
+        for i in range(766):
+            x = i*br/255
+            lut[i] = int(1000000*((6.74277e-14*x**4) - (1.25707e-10*x**3) + (8.07761e-8*x**2) + (2.30660e-5*x)))
+        self._powerLUT = lut
+        self._powerLUTBrightness = br
+
+    # The total idle current, in microamps, of all LEDs
+    def _idleCurrent(self):
+        return (self.numLEDs * 461474) // 1000
+
+    # Updates the current estimate for modified LEDs and returns the brightness at which the frame must be drawn to meet the current limit
+    def _limitCurrent(self):
+        if self._currentBrightness != self.brightness:
+            # Every LED's estimate depends on the brightness. power() may already have rebuilt the table, so the limit keeps its own record of the brightness its estimates are for.
+            if self._powerLUTBrightness != self.brightness:
+                self._buildPowerLUT()
+            self._currentTotal = self._updatePixelCurrent(0, self.numLEDs, self._currentTotal)
+            self._currentBrightness = self.brightness
+        else:
+            self._currentTotal = self._updatePixelCurrent(self._dirtyMin, self._dirtyMax, self._currentTotal)
+        total = self._currentTotal
+        budget = self._currentLimit - self._idleCurrent()
+        br = self.brightness
+        if total <= budget:
+            return br
+        if budget <= 0:
+            return 0
+        # Current is at most proportional to brightness, so scaling brightness by budget/total keeps the estimate within the limit.
+        # The ratio is calculated in units of 1/256 to avoid large integers.
+        return (br * (budget // ((total >> 8) + 1))) >> 8
+
+    # Recalculates the estimated current of LEDs [lo, hi), adding the change to total which is returned
+    @micropython.viper
+    def _updatePixelCurrent(self, lo: int, hi: int, total: int) -> int:
+        ar = ptr32(self._outAr)
+        lut = ptr32(self._powerLUT)
+        cache = ptr16(self._pixelCurrent)
+        for i in range(lo, hi):
+            c = int(ar[i])
+            p = int(lut[((c >> 16) & 0xFF) + ((c >> 8) & 0xFF) + (c & 0xFF)])
+            total += p - int(cache[i])
+            cache[i] = p
+        return total
 
     ## @brief Sets random colour values on every LED on the attached GlowBit display. This function is blocking, it does not return until the number of frames specified in the iters parameter have been drawn.
     #
@@ -358,6 +1639,7 @@ class glowbit(colourFunctions, colourMaps):
         while iters > 0:
             for i in range(int(self.numLEDs)):
                 ar[i] = int(random.randint(0, 0xFFFFFF))
+            self.markDirty()
             self.pixelsShow()
             iters -= 1
         self.blankDisplay()
@@ -374,7 +1656,7 @@ class glowbitMatrix(glowbit):
     #
     # If the x-y coordinate falls outside the display's boundary this function will "wrap-around". For example, A dot placed just off the right edge will appear along the left edge in the same row.
     #
-    # Advanced: If seeking maximum speed consider modifying the ar[] array directly
+    # Advanced: If seeking maximum speed consider modifying the ar[] array directly, followed by a call to markDirty()
     #
     # \param x The x coordinate of the GlowBit LED. x must be an integer.
     # \param y The y coordinate of the GlowBit LED. y must be an integer.
@@ -384,7 +1666,12 @@ class glowbitMatrix(glowbit):
     def pixelSetXY(self, x: int, y: int, colour: int):
         x = x % int(self.numLEDsX)
         y = y % int(self.numLEDsY)
-        self.ar[int(self.remap(x,y))] = colour
+        i = int(self._remapLUT[y*int(self.numLEDsX) + x])
+        self.ar[i] = colour
+        if i < int(self._dirtyMin):
+            self._dirtyMin = i
+        if i >= int(self._dirtyMax):
+            self._dirtyMax = i + 1
    
     ## @brief Sets the colour value of the GlowBit LED at a given x-y coordinate and immediately calls pixelsShow() to update the physical LEDs.
     #
@@ -392,7 +1679,7 @@ class glowbitMatrix(glowbit):
     #
     # If the x-y coordinate falls outside the display's boundary this function will "wrap-around". For example, A dot placed just off the right edge will appear along the left edge.
     # 
-    # Advanced: If seeking maximum speed consider modifying the ar[] array directly
+    # Advanced: If seeking maximum speed consider modifying the ar[] array directly, followed by a call to markDirty()
     #
     # \param x The x coordinate of the GlowBit LED. x must be an integer.
     # \param y The y coordinate of the GlowBit LED. y must be an integer.
@@ -402,8 +1689,12 @@ class glowbitMatrix(glowbit):
     def pixelSetXYNow(self, x: int, y: int, colour: int):
         x = x % int(self.numLEDsX)
         y = y % int(self.numLEDsY)
-        i = int(self.remap(x,y))
-        self.ar[i % int(self.numLEDs)] = colour
+        i = int(self._remapLUT[y*int(self.numLEDsX) + x])
+        self.ar[i] = colour
+        if i < int(self._dirtyMin):
+            self._dirtyMin = i
+        if i >= int(self._dirtyMax):
+            self._dirtyMax = i + 1
         self.pixelsShow()
     
     ## @brief Sets the colour value of the GlowBit LED at a given x-y coordinate
@@ -419,7 +1710,12 @@ class glowbitMatrix(glowbit):
     @micropython.viper
     def pixelSetXYClip(self, x: int, y: int, colour: int):
         if x >= 0 and y >= 0 and x < int(self.numLEDsX) and y < int(self.numLEDsY):
-            self.ar[int(self.remap(x,y))] = colour
+            i = int(self._remapLUT[y*int(self.numLEDsX) + x])
+            self.ar[i] = colour
+            if i < int(self._dirtyMin):
+                self._dirtyMin = i
+            if i >= int(self._dirtyMax):
+                self._dirtyMax = i + 1
 
     ## @brief Adds the colour value to the GlowBit LED at a given (x,y) coordinate
     #
@@ -437,8 +1733,12 @@ class glowbitMatrix(glowbit):
     def pixelAddXY(self, x: int, y: int, colour: int):
         x = x % int(self.numLEDsX)
         y = y % int(self.numLEDsY)
-        i = int(self.remap(x,y))
+        i = int(self._remapLUT[y*int(self.numLEDsX) + x])
         self.ar[i] = int(self.ar[i]) + colour
+        if i < int(self._dirtyMin):
+            self._dirtyMin = i
+        if i >= int(self._dirtyMax):
+            self._dirtyMax = i + 1
 
     ## @brief Adds the colour value to the GlowBit LED at a given (x,y) coordinate
     #
@@ -455,7 +1755,12 @@ class glowbitMatrix(glowbit):
     @micropython.viper
     def pixelAddXYClip(self, x: int, y: int, colour: int):
         if x >= 0 and y >= 0 and x < int(self.numLEDsX) and y < int(self.numLEDsY):
-            self.ar[int(self.remap(x,y))] = colour + int(self.ar[int(self.remap(x,y))])
+            i = int(self._remapLUT[y*int(self.numLEDsX) + x])
+            self.ar[i] = colour + int(self.ar[i])
+            if i < int(self._dirtyMin):
+                self._dirtyMin = i
+            if i >= int(self._dirtyMax):
+                self._dirtyMax = i + 1
    
     ## @brief Returns the 32-bit GlowBit colour value of the LED at a given (x,y) coordinate
     #
@@ -465,7 +1770,111 @@ class glowbitMatrix(glowbit):
     # \return The 32-bit GlowBit colour value of the i'th LED
 
     def getPixelXY(self, x, y):
-        return self.ar[self.remap(x,y)]
+        return self.ar[self._remapLUT[y*self.numLEDsX + x]]
+
+    ## @brief Rebuilds the lookup tables which map (x,y) coordinates to internal buffer indices, and buffer indices back to (x,y) coordinates.
+    #
+    # All coordinate drawing methods (pixelSetXY(), drawChar(), etc) index these tables instead of calling remap() for every pixel. The tables are built by the matrix constructors and must be rebuilt if the display's layout changes.
+    #
+    # Each row of the display is also split into runs: horizontal spans of pixels which occupy consecutive buffer indices, left to right. Methods such as blit() copy whole runs with a single slice assignment.
+    #
+    # \param mapFunction Optional. A function pointer to a new custom pixel mapping function, replacing remap(). If None the current remap() method is used.
+
+    def updateRemap(self, mapFunction = None):
+        if callable(mapFunction) is True:
+            self.remap = mapFunction
+        numX = self.numLEDsX
+        numY = self.numLEDsY
+        if self.numLEDs < 0xFFFF:
+            typecode = "H"
+        else:
+            typecode = "I"
+        self._remapLUT = array.array(typecode, [0 for _ in range(numX*numY)])
+        # Indices which are not mapped to by any (x,y) coordinate have an inverse of (0xFFFF, 0xFFFF)
+        self._remapInvX = array.array("H", [0xFFFF for _ in range(self.numLEDs)])
+        self._remapInvY = array.array("H", [0xFFFF for _ in range(self.numLEDs)])
+        remap = self.remap
+        for y in range(numY):
+            for x in range(numX):
+                i = int(remap(x,y))
+                self._remapLUT[y*numX + x] = i
+                if i >= 0 and i < self.numLEDs:
+                    self._remapInvX[i] = x
+                    self._remapInvY[i] = y
+        # True if every LED is mapped to by an (x,y) coordinate, so filling the whole display fills the whole buffer
+        self._remapComplete = 0xFFFF not in self._remapInvX
+        # _remapRun[y*numX + x] is the number of pixels from (x,y) to the right hand end of its run
+        self._remapRun = array.array("H", [1 for _ in range(numX*numY)])
+        lut = self._remapLUT
+        run = self._remapRun
+        for y in range(numY):
+            row = y*numX
+            for x in range(numX-2, -1, -1):
+                if lut[row + x + 1] == lut[row + x] + 1:
+                    run[row + x] = run[row + x + 1] + 1
+
+    ## @brief Returns the (x,y) coordinate of the i'th LED. This is the inverse of remap().
+    #
+    # \param i The index of the LED
+    # \return A tuple (x,y). If no coordinate maps to the LED (0xFFFF, 0xFFFF) is returned.
+
+    def indexToXY(self, i):
+        return (self._remapInvX[i], self._remapInvY[i])
+
+    ## @brief Copies a rectangular block of pixels onto the display with its upper left corner at (x,y).
+    #
+    # Pixels falling outside the display are clipped. Where the display's layout places neighbouring pixels at consecutive buffer indices (eg: along each row of an 8x8 module) they are copied with a single slice assignment.
+    #
+    # \param src The w*h block of 32-bit GlowBit colour values in row order, ie: the pixel at (sx,sy) within the block is src[sy*w + sx]. Copying is fastest if src is an array.array("I").
+    # \param x The x coordinate of the block's upper left corner
+    # \param y The y coordinate of the block's upper left corner
+    # \param w The width of the block
+    # \param h The height of the block
+    # \param key Optional. Pixels of this colour are transparent and aren't drawn. -1 (the default) draws every pixel.
+
+    def blit(self, src, x, y, w, h, key = -1):
+        # Slices of src are copied straight into the display buffer only if its items are known to be the same size
+        try:
+            copy = not isinstance(src, array.array) or src.typecode != "I"
+        except AttributeError:
+            # MicroPython arrays have no typecode attribute
+            copy = True
+        if copy:
+            src = array.array("I", src)
+        numX = self.numLEDsX
+        xa = max(x, 0)
+        xb = min(x + w, numX)
+        ya = max(y, 0)
+        yb = min(y + h, self.numLEDsY)
+        if xa >= xb or ya >= yb:
+            return
+        ar = self.ar
+        lut = self._remapLUT
+        run = self._remapRun
+        lo = self._dirtyMin
+        hi = self._dirtyMax
+        for dy in range(ya, yb):
+            row = dy*numX
+            srcRow = (dy - y)*w - x
+            s = xa
+            while s < xb:
+                # Copy the part of the run starting at s which is covered by the block
+                n = min(run[row + s], xb - s)
+                i = lut[row + s]
+                if key == -1:
+                    ar[i:i+n] = src[srcRow+s:srcRow+s+n]
+                else:
+                    for j in range(n):
+                        c = src[srcRow + s + j]
+                        if c != key:
+                            ar[i + j] = c
+                if i < lo:
+                    lo = i
+                if i + n > hi:
+                    hi = i + n
+                s += n
+        self._dirtyMin = lo
+        self._dirtyMax = hi
 
     ## @brief Draws a straight line between (x0,y0) and (x1,y1) in the specified 32-bit GlowBit colour.
     #
@@ -500,6 +1909,14 @@ class glowbitMatrix(glowbit):
             y0 = y1
             y1 = tmp
         
+        if y0 == y1:
+            # Horizontal (or, if steep, vertical) lines are drawn as a single span
+            if steep:
+                self._fillRect(y0, x0, y0, x1, colour, False)
+            else:
+                self._fillRect(x0, y0, x1, y0, colour, False)
+            return
+
         dx = x1 - x0;
         dy = int(abs(y1-y0))
         
@@ -568,11 +1985,8 @@ class glowbitMatrix(glowbit):
     # \param y1 The y coordinate of the lower right corner
     # \param colour A packed 32-bit GlowBit colour value
 
-    @micropython.viper
     def drawRectangleFill(self, x0: int, y0: int, x1: int, y1: int, colour):
-        for x in range(x0, x1+1):
-            for y in range(y0, y1+1):
-                self.pixelSetXY(x,y,colour)
+        self._fillRect(x0, y0, x1, y1, colour, False)
 
     ## @brief Draws a rectangle with upper-left corner (x0,y0) and lower right corner (x1, y1). The rectangle is then filled to form a solid block of the specified colour.
     #
@@ -586,11 +2000,84 @@ class glowbitMatrix(glowbit):
     # \param y1 The y coordinate of the lower right corner
     # \param colour A packed 32-bit GlowBit colour value
 
-    @micropython.viper
     def drawRectangleFillAdd(self, x0: int, y0: int, x1: int, y1: int, colour):
-        for x in range(x0, x1+1):
-            for y in range(y0, y1+1):
-                self.pixelAddXY(x,y,colour)
+        self._fillRect(x0, y0, x1, y1, colour, True)
+
+    # Sets (or if add is True, adds colour to) every pixel in the rectangle with corners (x0,y0) and (x1,y1), clipped to the display.
+    #
+    # The rectangle is split into spans of consecutive buffer indices using the runs built by updateRemap(). Spans which follow on from each other, such as the rows of a module, are merged before being written.
+    def _fillRect(self, x0, y0, x1, y1, colour, add):
+        numX = self.numLEDsX
+        if x0 < 0:
+            x0 = 0
+        if y0 < 0:
+            y0 = 0
+        if x1 >= numX:
+            x1 = numX - 1
+        if y1 >= self.numLEDsY:
+            y1 = self.numLEDsY - 1
+        if x0 > x1 or y0 > y1:
+            return
+        if self._remapComplete and x0 == 0 and y0 == 0 and x1 == numX - 1 and y1 == self.numLEDsY - 1:
+            self._fillRun(0, self.numLEDs, colour, add)
+            self._dirtyMin = 0
+            self._dirtyMax = self.numLEDs
+            return
+        lut = self._remapLUT
+        run = self._remapRun
+        lo = self._dirtyMin
+        hi = self._dirtyMax
+        # The pending span [start, end)
+        start = 0
+        end = 0
+        for y in range(y0, y1+1):
+            row = y*numX
+            x = x0
+            while x <= x1:
+                n = min(run[row + x], x1 + 1 - x)
+                i = lut[row + x]
+                x += n
+                if i == end:
+                    end += n
+                    continue
+                if end > start:
+                    self._fillRun(start, end - start, colour, add)
+                    if start < lo:
+                        lo = start
+                    if end > hi:
+                        hi = end
+                start = i
+                end = i + n
+        self._fillRun(start, end - start, colour, add)
+        if start < lo:
+            lo = start
+        if end > hi:
+            hi = end
+        self._dirtyMin = lo
+        self._dirtyMax = hi
+
+    if _SYSNAME == 'rp2':
+        # Sets (or if add is True, adds colour to) the n LEDs from index i
+        @micropython.viper
+        def _fillRun(self, i: int, n: int, colour: int, add: bool):
+            ar = ptr32(self.ar)
+            if add:
+                for k in range(i, i+n):
+                    ar[k] += colour
+            else:
+                for k in range(i, i+n):
+                    ar[k] = colour
+    else:
+        # Sets (or if add is True, adds colour to) the n LEDs from index i
+        def _fillRun(self, i, n, colour, add):
+            ar = self.ar
+            if add:
+                for k in range(i, i+n):
+                    ar[k] += colour
+            elif n == 1:
+                ar[i] = colour
+            else:
+                ar[i:i+n] = array.array("I", [colour]) * n
 
     ## @brief Draws a circle with center (x0,y0) and radius r. The circle's outline is drawn in the specified colour. Pixels inside the circle are not modified.
     # 
@@ -638,7 +2125,7 @@ class glowbitMatrix(glowbit):
         # \param minValue The value which will be mapped to the origin.
         # \param maxValue The value which will be mapped to the 'end' of the graph. The (x,y) coordinate will be 'length' pixels away from the origin in the direction specified by 'direction'.
         # \param colour A packed 32-bit GlowBit colour value. Used by the "Solid" colourmap, ignored by the "Rainbow" colourmap. Can also be accessed when writing custom colour map functions.
-        # \param colourMap Either the string "Solid" or "Rainbow" or a pointer to a custom colour map function. Custom colour maps must take the parameters colourMap(self, index, minIndex, maxIndex).
+        # \param colourMap Either the string "Solid" or "Rainbow", a colourGradient object, or a pointer to a custom colour map function. Custom colour maps must take the parameters colourMap(self, index, minIndex, maxIndex).
         # \param update If update=True then a call to updateGraph1D() will, in turn, call glowbit.pixelsShow() to update the physical LEDs.
         def __init__(self, originX = 0, originY = 7, length = 8, direction = "Up", minValue=0, maxValue=255, colour = 0xFFFFFF, colourMap = "Solid", update = False):
             self.minValue = minValue
@@ -678,7 +2165,29 @@ class glowbitMatrix(glowbit):
             elif colourMap == "Solid":
                 self.colourMap = self.colourMapSolid
             elif colourMap == "Rainbow":
-                self.colourMap = self.colourMapRainbow
+                self.colourMap = _builtinGradient("Rainbow")
+            else:
+                print("Invalid colourMap \"", colourMap, "\".")
+                print("Valid options: Solid, Rainbow, a colourGradient object or a colour map function")
+                print("Defaulting to Solid")
+                self.colourMap = self.colourMapSolid
+
+            # Buffer index of each pixel of the bar, starting at the origin. Looked up by updateGraph1D() from the display's remap table.
+            self._indices = None
+            self._remapLUT = None
+            # The number of pixels lit when the graph was last drawn, to the buffer _ar, or -1 if it hasn't been drawn
+            self._level = -1
+            self._ar = None
+            self._clearCount = 0
+            self._cacheColours()
+
+        # Computes the colour of each pixel of the bar, starting at the origin
+        def _cacheColours(self):
+            lo = self.originY if self.orientation == 1 else self.originX
+            hi = lo+(self.inc*self.length-1)
+            self._colours = array.array("I", [self.colourMap(lo+self.inc*n, lo, hi) for n in range(self.length)])
+            self._cachedColour = self.colour
+            self._cachedMap = self.colourMap
    
     ## @brief Wrapper method to create a graph1D object
     #
@@ -691,30 +2200,28 @@ class glowbitMatrix(glowbit):
     #
     # If the graph1D object was created with "update = True" this function will call pixelsShow() to update the physical display before returning.
     #
+    # Only the pixels between the previously drawn value and the new value are written. The whole graph is redrawn on its first update, after pixelsFill() or blankDisplay(), when drawing to a different layer, or when the graph's colour or colourMap has been changed.
+    #
     # \param graph A graph1D object as returned by glowbitMatrix.graph1D()
     # \param value The value to draw to the graph. It will be mapped to the graph bet
+    # \param force If True every pixel of the graph is redrawn. Use this if other drawing methods have overwritten part of the graph.
 
-    def updateGraph1D(self, graph, value):
+    def updateGraph1D(self, graph, value, force = False):
         N = round(graph.m*(value - graph.minValue))
-
-        m = graph.colourMap
-        if graph.orientation == 1:
-            n = 0
-            for idxY in range(graph.originY, graph.originY+graph.inc*(graph.length), graph.inc):
-                if n < N:
-                    self.pixelSetXY(graph.originX, idxY, m(idxY, graph.originY, graph.originY+(graph.inc*graph.length-1)))
-                else:
-                    self.pixelSetXY(graph.originX, idxY, 0)
-                n += 1
-
-        if graph.orientation == 0:
-            n = 0
-            for idxX in range(graph.originX, graph.originX+graph.inc*(graph.length), graph.inc):
-                if n < N:
-                    self.pixelSetXY(idxX, graph.originY, m(idxX, graph.originX, graph.originX+(graph.inc*graph.length-1)))
+        if graph._remapLUT is not self._remapLUT:
+            lut = self._remapLUT
+            graph._indices = array.array("I", [0 for _ in range(graph.length)])
+            x = graph.originX
+            y = graph.originY
+            for n in range(graph.length):
+                graph._indices[n] = lut[(y % self.numLEDsY)*self.numLEDsX + x % self.numLEDsX]
+                if graph.orientation == 1:
+                    y += graph.inc
                 else:
-                    self.pixelSetXY(idxX, graph.originY, 0)
-                n += 1
+                    x += graph.inc
+            graph._remapLUT = lut
+            force = True
+        self._drawGraph1D(graph, 0 if N < 0 else graph.length if N > graph.length else N, force)
 
         if graph.update == True:
             self.pixelsShow()
@@ -737,7 +2244,7 @@ class glowbitMatrix(glowbit):
         # \param maxValue The value which will be mapped to the upper edge.
         # \param colour A packed 32-bit GlowBit colour value. Used by the "Solid" colourmap, ignored by the "Rainbow" colourmap. Can also be accessed when writing custom colour map functions.
         # \param bgColour A packed 32-bit GlowBit colour value which is drawn to the entire graph area prior to drawing the data.
-        # \param colourMap Either the string "Solid" or "Rainbow" or a pointer to a custom colour map function. Custom colour maps must take the parameters colourMap(self, index, minIndex, maxIndex).
+        # \param colourMap Either the string "Solid" or "Rainbow", a colourGradient object, or a pointer to a custom colour map function. Custom colour maps must take the parameters colourMap(self, index, minIndex, maxIndex).
         # \param update If update=True then a call to updateGraph2D() will, in turn, call glowbit.pixelsShow() to update the physical LEDs.
 
         def __init__(self, originX = 0, originY = 7, width = 8, height = 8, minValue=0, maxValue=255, colour = 0xFFFFFF, bgColour = 0x000000, colourMap = "Solid", update = False, bars = False):
@@ -754,40 +2261,440 @@ class glowbitMatrix(glowbit):
             self.offset = originY+self.m*minValue
             self.bars = bars
             
-            self.data = []
+            # Ring buffers of the last width values and the row drawn for each. The newest is at _history[_head].
+            self._history = array.array("i", [0 for _ in range(max(width, 1))])
+            self._values = [0 for _ in range(max(width, 1))]
+            self._head = 0
+            self._count = 0
             
             if callable(colourMap) == True:
                 self.colourMap = colourMap
             elif colourMap == "Solid":
                 self.colourMap = self.colourMapSolid
             elif colourMap == "Rainbow":
-                self.colourMap = self.colourMapRainbow
+                self.colourMap = _builtinGradient("Rainbow")
+            else:
+                print("Invalid colourMap \"", colourMap, "\".")
+                print("Valid options: Solid, Rainbow, a colourGradient object or a colour map function")
+                print("Defaulting to Solid")
+                self.colourMap = self.colourMapSolid
+
+            # The display layout the graph's buffer indices were computed for, set by glowbitMatrix._drawGraph2D()
+            self._remapLUT = None
+            # The buffer the graph was last drawn to, or None if it must be redrawn in full
+            self._ar = None
+            self._clearCount = 0
+            self._cacheColours()
+
+        # Computes the colour drawn in each row of the graph, from the top row down
+        def _cacheColours(self):
+            top = self.originY-self.height+1
+            lo = self.originY
+            hi = self.originY+self.height-1
+            if self.bars == True:
+                self._colours = array.array("I", [self.colourMap(y, lo, hi) for y in range(top, self.originY+1)])
+            else:
+                self._colours = array.array("I", [self.colourMap(y - self.originY, lo, hi) for y in range(top, self.originY+1)])
+            self._cachedColour = self.colour
+            self._cachedMap = self.colourMap
+            self._cachedBgColour = self.bgColour
+            self._cachedBars = self.bars
+
+        ## @brief Returns the graph's history as a list of the rows drawn for each value, newest first.
+        def getHistory(self):
+            return [self._history[(self._head - k) % len(self._history)] for k in range(self._count)]
+
+        ## @brief The values passed to updateGraph2D() which are on the graph, newest first. Read only; a new list is built from the graph's history on each access.
+        @property
+        def data(self):
+            return [self._values[(self._head - k) % len(self._values)] for k in range(self._count)]
     
     ## @brief Updates a 2D graph with a new value.
     # 
+    # The pixels already drawn are moved one column to the left and only the new rightmost column is drawn. The whole graph is redrawn on its first update, after pixelsFill() or blankDisplay(), when drawing to a different layer, or when the graph's colour, bgColour, colourMap or bars setting has been changed.
+    #
     # \param graph A graph2D object created graph2D
     # \param value A new value to draw to the graph. This value will be drawn on the right edge and the oldest value will be deleted.
+    # \param force If True every pixel of the graph is redrawn. Use this if other drawing methods have overwritten part of the graph.
 
-    def updateGraph2D(self, graph, value):
-        graph.data.insert(0,value)
-        if len(graph.data) > graph.width:
-            graph.data.pop()
-        x = graph.originX+graph.width-1
-        m = graph.colourMap
-        self.drawRectangleFill(graph.originX, graph.originY-graph.height+1, graph.originX+graph.width-1, graph.originY, graph.bgColour)
-        for value in graph.data:
-            y = round(-graph.height/(graph.maxValue-graph.minValue )*(value - graph.minValue) + graph.originY + 1)
-            if graph.bars == True:
-                for idx in range(y, graph.originY+1):
-                    if x >= graph.originX and x < graph.originX+graph.width and idx <= graph.originY and idx > graph.originY-graph.height:
-                        self.pixelSet(self.remap(x,idx), m(idx, graph.originY, graph.originY+graph.height-1))
-            else:
-                if x >= graph.originX and x < graph.originX+graph.width and y <= graph.originY and y > graph.originY-graph.height:
-                    self.pixelSet(self.remap(x,y), m(y - graph.originY, graph.originY, graph.originY+graph.height-1))
-            x -= 1
+    def updateGraph2D(self, graph, value, force = False):
+        self._drawGraph2D(graph, value, force)
         if graph.update == True:
             self.pixelsShow()
 
+    ## @brief Coroutine which updates a 2D graph once per frame. Intended to be run as an asyncio task.
+    #
+    # Each frame valueFunction() is called and its return value drawn with updateGraph2D(), then pixelsShowAsync() updates the physical LEDs. The graph's update setting is ignored.
+    #
+    # \param graph A graph2D object created by graph2D
+    # \param valueFunction A function taking no arguments which returns the next value to draw to the graph.
+    # \param iters The number of frames to draw. A value of -1 runs forever.
+
+    async def updateGraph2DAsync(self, graph, valueFunction, iters = -1):
+        while iters != 0:
+            self._drawGraph2D(graph, valueFunction(), False)
+            await self.pixelsShowAsync()
+            if iters > 0:
+                iters -= 1
+
+    # Draws a new value to a graph2D. The pixels already drawn are moved one column to the left and only the rightmost column is drawn, unless the graph must be redrawn in full.
+    def _drawGraph2D(self, graph, value, force):
+        top = graph.originY-graph.height+1
+        y = round(-graph.height/(graph.maxValue-graph.minValue )*(value - graph.minValue) + graph.originY + 1)
+        # Rows above or below the graph area are all drawn the same
+        y = top-1 if y < top else graph.originY+1 if y > graph.originY else y
+        if graph.width <= 0:
+            return
+        graph._head = (graph._head + 1) % graph.width
+        graph._history[graph._head] = y
+        graph._values[graph._head] = value
+        if graph._count < graph.width:
+            graph._count += 1
+
+        if graph._remapLUT is not self._remapLUT:
+            self._layoutGraph2D(graph)
+            force = True
+        if graph.colour != graph._cachedColour or graph.colourMap is not graph._cachedMap or graph.bgColour != graph._cachedBgColour or graph.bars != graph._cachedBars:
+            graph._cacheColours()
+            force = True
+        if graph._ar is not self.ar or graph._clearCount != self._clearCount:
+            force = True
+        graph._ar = self.ar
+        graph._clearCount = self._clearCount
+        cols = graph._numCols
+        if cols == 0 or graph._numRows == 0:
+            return
+
+        if force:
+            for c in range(cols):
+                self._drawGraph2DColumn(graph, c)
+        else:
+            self._copyRuns(graph._shiftPlan)
+            self._drawGraph2DColumn(graph, cols-1)
+        if graph._lo < self._dirtyMin:
+            self._dirtyMin = graph._lo
+        if graph._hi > self._dirtyMax:
+            self._dirtyMax = graph._hi
+
+    # Draws the value for the c'th visible column of a graph2D
+    def _drawGraph2DColumn(self, graph, c):
+        # The age of the value drawn in column c: the rightmost column of the graph holds the newest value
+        age = graph.originX+graph.width-1 - (graph._x0 + c)
+        ar = self.ar
+        idx = graph._columns
+        colours = graph._colours
+        bg = graph.bgColour
+        rows = graph._numRows
+        top = graph.originY-graph.height+1
+        if age >= graph._count:
+            for r in range(rows):
+                ar[idx[c*rows + r]] = bg
+            return
+        y = graph._history[(graph._head - age) % graph.width]
+        if graph.bars == True:
+            for r in range(rows):
+                row = graph._y0 + r
+                ar[idx[c*rows + r]] = colours[row - top] if row >= y else bg
+        else:
+            for r in range(rows):
+                row = graph._y0 + r
+                ar[idx[c*rows + r]] = colours[row - top] if row == y else bg
+
+    # Computes the buffer indices of a graph2D's area, clipped to the display. _columns holds the indices column by column and _shiftPlan the copies which move every column one to the left.
+    def _layoutGraph2D(self, graph):
+        numX = self.numLEDsX
+        lut = self._remapLUT
+        run = self._remapRun
+        x0 = max(graph.originX, 0)
+        x1 = min(graph.originX+graph.width, numX)
+        y0 = max(graph.originY-graph.height+1, 0)
+        y1 = min(graph.originY+1, self.numLEDsY)
+        cols = max(x1 - x0, 0)
+        rows = max(y1 - y0, 0)
+        if cols == 0 or rows == 0:
+            cols = 0
+            rows = 0
+        graph._x0 = x0
+        graph._y0 = y0
+        graph._numCols = cols
+        graph._numRows = rows
+        graph._columns = array.array("I", [lut[(y0 + r)*numX + x0 + c] for c in range(cols) for r in range(rows)])
+        graph._lo = min(graph._columns) if cols > 0 else 0
+        graph._hi = max(graph._columns) + 1 if cols > 0 else 0
+        # Entries are (dst, src, n) triples: ar[dst:dst+n] = ar[src:src+n]. Runs of consecutive indices along a row are moved in one copy, working left to right so every pixel is read before it is overwritten.
+        plan = []
+        for y in range(y0, y1):
+            row = y*numX
+            x = x0
+            while x < x1 - 1:
+                n = min(run[row + x], x1 - x)
+                i = lut[row + x]
+                if n > 1:
+                    plan += [i, i + 1, n - 1]
+                if x + n < x1:
+                    plan += [i + n - 1, lut[row + x + n], 1]
+                x += n
+        graph._shiftPlan = array.array("I", plan)
+        graph._remapLUT = lut
+
+    if _SYSNAME == 'rp2':
+        # Performs the copies in a plan of (dst, src, n) triples, as built by _layoutGraph2D()
+        @micropython.viper
+        def _copyRuns(self, plan):
+            ar = ptr32(self.ar)
+            p = ptr32(plan)
+            end = int(len(plan))
+            k = 0
+            while k < end:
+                dst = p[k]
+                src = p[k+1]
+                for j in range(p[k+2]):
+                    ar[dst + j] = ar[src + j]
+                k += 3
+    else:
+        # Performs the copies in a plan of (dst, src, n) triples, as built by _layoutGraph2D()
+        def _copyRuns(self, plan):
+            ar = self.ar
+            for k in range(0, len(plan), 3):
+                dst = plan[k]
+                src = plan[k+1]
+                n = plan[k+2]
+                if n == 1:
+                    ar[dst] = ar[src]
+                else:
+                    ar[dst:dst+n] = ar[src:src+n]
+
+    ## @brief A fixed-capacity system of particles, drawn and moved by glowbitMatrix.updateParticles().
+    #
+    # Particle state is kept in parallel arrays indexed by particle number, with positions and velocities in fixed point units of 1/256 pixel. Free particle numbers are kept on a stack so spawning and killing particles takes constant time.
+
+    class particleSystem():
+
+        ## @brief Initialisation routine for particleSystem objects.
+        #
+        # \param capacity The maximum number of live particles
+        # \param palette A list of particle colours, selected by the colour argument of spawnParticle(). Each entry is either a 32-bit GlowBit colour value, which is drawn at the head of the particle and halved in brightness for each trail pixel behind it, or a list of colours for the head and then each trail pixel.
+        # \param trail The number of trail pixels drawn behind each particle, in the opposite direction to its velocity.
+        # \param gravity Added to every particle's y velocity each frame, in pixels per frame per frame.
+        # \param edges What happens at the display's edges. "Kill" removes particles once they and their trail have left the display. "Bounce" reverses the velocity of particles which reach an edge.
+        # \param blend How particles are drawn. "Replace" overwrites the display buffer and "Add" adds to it with saturating arithmetic.
+        # \param erase If True the pixels drawn by the previous call to updateParticles() are set to 0 before particles are drawn, so particles can move over a black background without the display being cleared every frame.
+
+        def __init__(self, capacity = 64, palette = [0xFFFFFF], trail = 0, gravity = 0, edges = "Kill", blend = "Replace", erase = True):
+            self.capacity = capacity
+            self.trail = max(0, int(trail))
+            self.gravity = int(gravity*256)
+            if edges != "Kill" and edges != "Bounce":
+                print("Invalid edges \"", edges, "\".")
+                print("Valid options: Kill, Bounce")
+                print("Defaulting to Kill")
+                edges = "Kill"
+            self.edges = edges
+            if blend != "Replace" and blend != "Add":
+                print("Invalid blend \"", blend, "\".")
+                print("Valid options: Replace, Add")
+                print("Defaulting to Replace")
+                blend = "Replace"
+            self.blend = blend
+            self.erase = erase
+            ## Particle state. x and y are the position and vx and vy the velocity, in 1/256 pixel and 1/256 pixel per frame. life is the number of frames the particle has left, -1 if it lives until killed or 0 if the particle number is free. colour is an index into the palette.
+            self.x = array.array("i", [0 for _ in range(capacity)])
+            self.y = array.array("i", [0 for _ in range(capacity)])
+            self.vx = array.array("i", [0 for _ in range(capacity)])
+            self.vy = array.array("i", [0 for _ in range(capacity)])
+            self.life = array.array("i", [0 for _ in range(capacity)])
+            self.colour = array.array("i", [0 for _ in range(capacity)])
+            ## The number of live particles
+            self.count = 0
+            # Stack of free particle numbers; the top is _free[_numFree-1]
+            self._free = array.array("i", range(capacity-1, -1, -1))
+            self._numFree = capacity
+            # Buffer indices drawn by the last update, which are erased by the next
+            self._drawn = array.array("i", [0 for _ in range(capacity*(self.trail+1))])
+            self._numDrawn = 0
+            self.updatePalette(palette)
+
+        ## @brief Replaces the palette. See particleSystem().
+        #
+        # \param palette A list of particle colours
+        def updatePalette(self, palette):
+            n = self.trail + 1
+            # The fade table holds the colour of the head and each trail pixel for every palette entry
+            self._fade = array.array("I", [0 for _ in range(len(palette)*n)])
+            for c in range(len(palette)):
+                for k in range(n):
+                    if type(palette[c]) is list:
+                        colour = palette[c][k] if k < len(palette[c]) else 0
+                    else:
+                        colour = (palette[c] >> k) & ((0xFF >> k) * 0x010101)
+                    self._fade[c*n + k] = colour & 0xFFFFFF
+
+    ## @brief Wrapper method to create a particleSystem object
+    #
+    # Calling matrix.particleSystem() directly is recommended - this is only here so that it appears more clearly in the Doxygen.
+
+    def newParticleSystem(self, capacity = 64, palette = [0xFFFFFF], trail = 0, gravity = 0, edges = "Kill", blend = "Replace", erase = True):
+        return self.particleSystem(capacity, palette, trail, gravity, edges, blend, erase)
+
+    ## @brief Adds a particle to a particle system.
+    #
+    # \param system A particleSystem object
+    # \param x The particle's initial x coordinate, in pixels
+    # \param y The particle's initial y coordinate, in pixels
+    # \param vx The particle's x velocity, in pixels per frame
+    # \param vy The particle's y velocity, in pixels per frame
+    # \param life The number of frames the particle is drawn for, or -1 if it lives until it leaves the display or is killed.
+    # \param colour The index of the particle's colour in the system's palette
+    # \return The particle's number, or -1 if the system is full
+
+    def spawnParticle(self, system, x, y, vx = 0, vy = 0, life = -1, colour = 0):
+        if system._numFree == 0:
+            return -1
+        system._numFree -= 1
+        p = system._free[system._numFree]
+        system.x[p] = int(x*256)
+        system.y[p] = int(y*256)
+        system.vx[p] = int(vx*256)
+        system.vy[p] = int(vy*256)
+        system.life[p] = -1 if life < 0 else max(1, int(life))
+        system.colour[p] = colour
+        system.count += 1
+        return p
+
+    ## @brief Removes a particle from a particle system. The particle's pixels are erased by the next updateParticles() call if the system erases.
+    #
+    # \param system A particleSystem object
+    # \param p The particle number returned by spawnParticle()
+
+    def killParticle(self, system, p):
+        if system.life[p] != 0:
+            system.life[p] = 0
+            system._free[system._numFree] = p
+            system._numFree += 1
+            system.count -= 1
+
+    ## @brief Moves every particle in a particle system by one frame and draws them to the display buffer.
+    #
+    # Particles whose life has run out, or which have left the display if the system's edges are "Kill", are removed. A call to pixelsShow() must be done manually to update the physical LEDs.
+    #
+    # \param system A particleSystem object
+
+    @micropython.viper
+    def updateParticles(self, system):
+        ar = ptr32(self.ar)
+        lut = self._remapLUT
+        numX = int(self.numLEDsX)
+        numY = int(self.numLEDsY)
+        px = ptr32(system.x)
+        py = ptr32(system.y)
+        pvx = ptr32(system.vx)
+        pvy = ptr32(system.vy)
+        life = ptr32(system.life)
+        colour = ptr32(system.colour)
+        free = ptr32(system._free)
+        drawn = ptr32(system._drawn)
+        fade = ptr32(system._fade)
+        numFree = int(system._numFree)
+        numDrawn = int(system._numDrawn)
+        count = int(system.count)
+        trail = int(system.trail)
+        gravity = int(system.gravity)
+        bounce = system.edges == "Bounce"
+        add = system.blend == "Add"
+        lo = int(self._dirtyMin)
+        hi = int(self._dirtyMax)
+        if system.erase:
+            for k in range(numDrawn):
+                i = drawn[k]
+                ar[i] = 0
+                if i < lo:
+                    lo = i
+                if i >= hi:
+                    hi = i + 1
+        numDrawn = 0
+        maxX = (numX - 1) << 8
+        maxY = (numY - 1) << 8
+        for p in range(int(system.capacity)):
+            t = life[p]
+            if t == 0:
+                continue
+            vx = pvx[p]
+            vy = pvy[p] + gravity
+            x = px[p] + vx
+            y = py[p] + vy
+            dead = False
+            if bounce:
+                if x < 0:
+                    x = -x
+                    vx = -vx
+                elif x > maxX:
+                    x = maxX + maxX - x
+                    vx = -vx
+                if y < 0:
+                    y = -y
+                    vy = -vy
+                elif y > maxY:
+                    y = maxY + maxY - y
+                    vy = -vy
+            elif x < (-trail-1) << 8 or y < (-trail-1) << 8 or x >= (numX + trail) << 8 or y >= (numY + trail) << 8:
+                dead = True
+            if dead:
+                life[p] = 0
+                free[numFree] = p
+                numFree += 1
+                count -= 1
+                continue
+            px[p] = x
+            py[p] = y
+            pvx[p] = vx
+            pvy[p] = vy
+            # The trail is drawn one pixel at a time back along the direction of travel
+            sx = 0
+            if vx > 0:
+                sx = 1
+            elif vx < 0:
+                sx = -1
+            sy = 0
+            if vy > 0:
+                sy = 1
+            elif vy < 0:
+                sy = -1
+            hx = x >> 8
+            hy = y >> 8
+            base = colour[p]*(trail + 1)
+            for k in range(trail + 1):
+                tx = hx - k*sx
+                ty = hy - k*sy
+                if tx >= 0 and ty >= 0 and tx < numX and ty < numY:
+                    i = int(lut[ty*numX + tx])
+                    b = fade[base + k]
+                    if add:
+                        # All three channels are added at once; see _addSaturating()
+                        a = ar[i] & 0xFFFFFF
+                        s = ((a & 0x7F7F7F) + (b & 0x7F7F7F)) ^ ((a ^ b) & 0x808080)
+                        carry = ((a & b) | ((a | b) & ~s)) & 0x808080
+                        b = s | ((carry >> 7) * 0xFF)
+                    ar[i] = b
+                    drawn[numDrawn] = i
+                    numDrawn += 1
+                    if i < lo:
+                        lo = i
+                    if i >= hi:
+                        hi = i + 1
+                if sx == 0 and sy == 0:
+                    break
+            if t > 0:
+                life[p] = t - 1
+                if t == 1:
+                    free[numFree] = p
+                    numFree += 1
+                    count -= 1
+        system._numFree = numFree
+        system._numDrawn = numDrawn
+        system.count = count
+        self._dirtyMin = lo
+        self._dirtyMax = hi
+
     ## @brief Demonstrate drawing an animated line
 
     def lineDemo(self, iters = 10):
@@ -804,24 +2711,31 @@ class glowbitMatrix(glowbit):
             iters -= 1
         self.blankDisplay()
     
-    ## @brief Demonstrate drawing randomly placed, randomly coloured, expanding circles.
+    ## @brief Demonstrate drawing randomly placed, randomly coloured expanding circles with a particleSystem.
     #
-    # Note that pixelsFill(0) is only called after drawing an expanding circle, simulating a mostly filled circle. Gaps are an artefact of the circle drawing algorithm, not a bug.
+    # Each circle is a ring of particles moving outwards one pixel per frame from its centre. The particles don't erase the pixels they drew, so the circle fills in as it grows, and a second ring of black particles then clears it from the centre outwards.
 
     def fireworks(self, iters = 10):
         self.blankDisplay()
         import random
+        import math
+        radius = self.numLEDsX//2
+        # Enough particles that adjacent particles are at most a pixel apart on the largest circle
+        n = max(8, 8*radius)
+        directions = [(math.cos(2*math.pi*k/n), math.sin(2*math.pi*k/n)) for k in range(n)]
+        ring = self.particleSystem(capacity = n, palette = [0xFFFFFF, 0x000000], erase = False)
         while iters > 0:
             self.pixelsFill(0)
-            colour = random.randint(0, 0xFFFFFF)
+            ring.updatePalette([random.randint(0, 0xFFFFFF), 0x000000])
             Cx = random.randint(0, self.numLEDsX-1)
             Cy = random.randint(0, self.numLEDsY-1)
-            for r in range(self.numLEDsX//2):
-                self.drawCircle(Cx, Cy, r, colour)
-                self.pixelsShow()
-            for r in range(self.numLEDsX//2):
-                self.drawCircle(Cx, Cy, r, 0)
-                self.pixelsShow()
+            for colour in (0, 1):
+                # Particles move before they are drawn, so they start one step behind the centre. The half pixel offset rounds positions to the nearest pixel.
+                for dx, dy in directions:
+                    self.spawnParticle(ring, Cx + 0.5 - dx, Cy + 0.5 - dy, dx, dy, radius, colour)
+                for r in range(radius):
+                    self.updateParticles(ring)
+                    self.pixelsShow()
             iters -= 1
     
     ## @brief Demonstration of a rainbow effect is pseudo-polar coordinates.
@@ -853,7 +2767,7 @@ class glowbitMatrix(glowbit):
                     pixelSetXY(x,y,wheel((r*300)//maxX - colourOffset*10))
             show()
 
-    ## @brief A class used by the rain() demonstration
+    ## @brief A class formerly used by the rain() demonstration. rain() now uses a particleSystem; this class is kept for compatibility.
 
     class raindrop():
         def __init__(self, x, speed):
@@ -868,7 +2782,7 @@ class glowbitMatrix(glowbit):
         def getY(self):
             return (self.y//10)
 
-    ## @brief A "digital rain" demonstration.
+    ## @brief A "digital rain" demonstration, drawn with a particleSystem.
     #
     # \param iters The number of frames on which raindrops can be drawn
     # \param density The density of raindrops in units of "drops per 4x4 square". The number of drops on the screen will be kept at (number of pixels)*(density)/16
@@ -876,41 +2790,19 @@ class glowbitMatrix(glowbit):
     def rain(self, iters = 200, density=1):
         import random
         self.blankDisplay()
-        drops = []
-        toDel = []
         c1 = self.rgbColour(200,255,200)
         c2 = self.rgbColour(0,127,0)
         c3 = self.rgbColour(0,64,0)
         c4 = self.rgbColour(0,32,0)
         c5 = self.rgbColour(0,16,0)
-        iter = 0
-        p = random.randint(0,self.numLEDsX)
-        drops.append(self.raindrop(p, random.randint(2,round(self.numLEDsX))))
-        while len(drops) > 0:
-            while len(drops)/(density) < self.numLEDs/16 and iters > 0:
-                p = random.randint(0,self.numLEDsX)
-                drops.append(self.raindrop(p, random.randint(2,round(self.numLEDsX))))
-            '''
-            Optimised the fill out by just making sure the last pixel drawn in a drop is zero
-            '''
-            for drop in drops:
-                (x,y) = drop.update()
-                py = y
-                self.pixelSetXYClip(x,y, c1)
-                self.pixelSetXYClip(x,y-1, c2)
-                self.pixelSetXYClip(x,y-2, c3)
-                self.pixelSetXYClip(x,y-3, c4)
-                self.pixelSetXYClip(x,y-4, c5)
-                self.pixelSetXYClip(x,y-5, 0)
-                self.pixelSetXYClip(x,y-6, 0)
-                self.pixelSetXYClip(x,y-7, 0)
-
-            for drop in reversed(drops):
-                if drop.getY() > self.numLEDsY+6:
-                    drops.remove(drop)
-
+        drops = self.particleSystem(capacity = int(self.numLEDs*density/16) + 2, palette = [[c1, c2, c3, c4, c5]], trail = 4)
+        self.spawnParticle(drops, random.randint(0,self.numLEDsX-1), 0, 0, random.randint(2,round(self.numLEDsX))/10)
+        while drops.count > 0:
+            while drops.count/(density) < self.numLEDs/16 and iters > 0:
+                self.spawnParticle(drops, random.randint(0,self.numLEDsX-1), 0, 0, random.randint(2,round(self.numLEDsX))/10)
+            self.updateParticles(drops)
             iters -= 1
-            self.pixelsShow();
+            self.pixelsShow()
 
     ## @brief Demonstrates creation of non-blocking scrolling text. Only compatible with the GlowBit Matrix 8x8 and tiled arrangements thereof.
     #
@@ -923,24 +2815,16 @@ class glowbitMatrix(glowbit):
             self.updateTextScroll()
             self.pixelsShow()
 
-    ## @brief Draws a single pixel at a random coordinate and "bounces" it around the display
+    ## @brief Draws a single pixel at a random coordinate and "bounces" it around the display, using a particleSystem with "Bounce" edges
 
     def bounce(self, iters = 500):
         import random
-        Px = random.randint(0, self.numLEDsX-1)
-        Py = random.randint(0, self.numLEDsY-1)
-        Vx = 2*random.random()-1
-        Vy = 2*random.random()-1
+        ball = self.particleSystem(capacity = 1, palette = list(_builtinGradient("Rainbow").lut), edges = "Bounce")
+        p = self.spawnParticle(ball, random.randint(0, self.numLEDsX-1), random.randint(0, self.numLEDsY-1), 2*random.random()-1, 2*random.random()-1)
 
         while iters > 0:
-            self.pixelSetXY(int(Px), int(Py), 0)
-            Px += Vx
-            Py += Vy
-            self.pixelSetXY(int(Px), int(Py), self.wheel(iters%255))
-            if Px < 1 or Px > self.numLEDsX-1:
-                Vx *= -1
-            if Py < 1 or Py > self.numLEDsY-1:
-                Vy *= -1
+            ball.colour[p] = iters%255
+            self.updateParticles(ball)
             iters -= 1
             self.pixelsShow()
         self.blankDisplay()
@@ -977,26 +2861,14 @@ class stick(glowbit):
     # \param brightness The relative brightness of the LEDs. Colours drawn to the internal buffer should be in the range [0,255] and the brightness parameter scales this value before drawing to the physical display. If brightness is an integer it should be in the range [0,255]. If brightness is floating point it is assumed to be in the range [0,1.0].
     # \param rateLimitFPS The maximum frame rate of the display in frames per second. The pixelsShow() function blocks to enforce this limit.
     # \param sm (Raspberry Pi Pico only) The PIO state machine to generate the GlowBit data stream. Each connected GlowBit display chain requires a unique state machine. Valid values are in the range [0,7].
+    # \param gcPolicy (Raspberry Pi Pico only) When pixelsShow() runs the garbage collector. One of "EveryFrame", "EveryNFrames", "Threshold" or "Never". See updateGCPolicy().
+    # \param backend The output backend which transmits frames. One of "Hardware" (the GlowBit display connected to pin), "Null" (frames are discarded), "Recording" (frames are recorded by a recordingBackend) or a backend class; see registerBackend(). If not given the GLOWBIT_BACKEND environment variable is used, defaulting to "Hardware".
+    # \param segments Splits the display across several outputs which transmit at the same time. A list of (pin, range(start, stop)) or (pin, start, stop) segments, each driving LEDs [start, stop) from its own pin; pin is then ignored. On the Raspberry Pi Pico each segment uses its own state machine, numbered upwards from sm. On the Raspberry Pi at most two segments are valid, one on pin 18 or 12 and one on pin 13 or 19. If None the whole display is driven from pin.
 
-    def __init__(self, numLEDs = 8, pin = 18, brightness = 20, rateLimitFPS = 30, sm = 0):
-        if _SYSNAME == 'rp2':
-            self.sm = rp2.StateMachine(sm, self._ws2812, freq=8_000_000, sideset_base=Pin(pin))
-            self.sm.active(1)
-            self.pixelsShow = self._pixelsShowPico
-            self.ticks_ms = time.ticks_ms
-
+    def __init__(self, numLEDs = 8, pin = 18, brightness = 20, rateLimitFPS = 30, sm = 0, gcPolicy = "EveryFrame", backend = None, segments = None):
         self.numLEDs = numLEDs
+        self._initOutput(pin, sm, backend, gcPolicy, segments)
 
-        if _SYSNAME == 'Linux':
-            self.strip = ws.PixelStrip(numLEDs, pin)
-            self.strip.begin()
-            self.pixelsShow = self._pixelsShowRPi
-            self.ticks_ms = self._ticks_ms_Linux
-
-        self.lastFrame_ms = self.ticks_ms()
-
-        self.ar = array.array("I", [0 for _ in range(self.numLEDs)])
-        self.dimmer_ar = array.array("I", [0 for _ in range(self.numLEDs)])
         if rateLimitFPS > 0: 
             self.rateLimit = rateLimitFPS
         else:
@@ -1010,17 +2882,30 @@ class stick(glowbit):
         self.pixelsFill(0)
         self.pixelsShow()
         
-        # The list of pulses which are drawn upon a call 
-        self.pulses = []
-
-    ## @brief A class for animating "pulses" which move down a GlowBit stick.
+        # Pulses are stored in parallel arrays; pulse k occupies entry k of each array and _pulseWidth[k] entries of _pulseColours from _pulseOffset[k]. Pulses [0, _numPulses) are live and are kept contiguous by updatePulses().
+        self._numPulses = 0
+        self._pulsePos = array.array("i", [0 for _ in range(16)])
+        self._pulseSpeed = array.array("i", [0 for _ in range(16)])
+        self._pulseWidth = array.array("I", [0 for _ in range(16)])
+        self._pulseOffset = array.array("I", [0 for _ in range(16)])
+        # Index into _pulseMapTables of the colour map for the pulse's mapped pixels, or -1 if they are drawn black
+        self._pulseMap = array.array("i", [0 for _ in range(16)])
+        self._pulseColours = array.array("I", [0 for _ in range(64)])
+        self._pulseColoursUsed = 0
+        # The colour of every LED under each colour map used by a pulse, computed when the colour map is first used
+        self._pulseMapKeys = []
+        self._pulseMapTables = []
+        # The tables stacked into a NumPy array by _updatePulsesNumpy()
+        self._pulseTableStack = None
+
+    ## @brief A pulse moving along a GlowBit Stick display.
+    #
+    # Pulses are stored by the stick in parallel arrays, not as pulse objects. The pulses property returns a snapshot of the live pulses as pulse objects; changing a snapshot doesn't change the pulse on the display. Use addPulse() to add a pulse.
 
     class pulse(colourFunctions, colourMaps):
 
         ## @brief Initialisation routine for the GlowBit Stick pulse object.
         #
-        # This function uses the pixelSaturatingAdd() method so multiple pulses can be drawn without colour values corrupting due to addition overflow. 
-        #
         # \param speed The speed of the pulse in units of (pixels moved per frame) * 100. A value of 100 means the pulse will move 1 pixels per frame. A speed of 1 will move a pulse 1 pixel every 100 frames. Speed can be positive or negative to allow pulses to move in either direction.
         # \param colour A list of 32-bit GlowBit colours for the pulse. The pulse will have a width equal to the number of elements in this list. A list entry of -1 will have the colour set by a colour map function.
         # \param index The initial index of the pulse. Generally recommended to set to 0 if speed > 0 and numLEDs if speed < 0.
@@ -1029,7 +2914,7 @@ class stick(glowbit):
         def __init__(self, speed = 100, colour = [0xFFFFFF], index = 0, colourMap = None):
             ## Speed of the pulse
             self.speed = speed 
-            ## Initial index of the pulse
+            ## Index of the head of the pulse
             self.index = index
             self._position = self.index*100 # index * 100
            
@@ -1045,49 +2930,252 @@ class stick(glowbit):
             elif colourMap == "Solid":
                 self.colourMap = self.colourMapSolid
             elif colourMap == "Rainbow":
-                self.colourMap = self.colourMapRainbow
+                self.colourMap = _builtinGradient("Rainbow")
             else:
                 self.colourMap = None
-            
-        def _update(self):
-            self._position += self.speed
-            self.index = self._position//100
 
-    ## @brief Add a pulse to the list of pulses    
+    ## @brief A snapshot of the pulses still on the display, as a list of pulse objects in the order they were added.
+    #
+    # The list is built from the stick's pulse arrays on each access. Modifying it, or the pulse objects in it, doesn't change the pulses drawn by updatePulses(). Use addPulse() and clearPulses() to change the pulses.
+    @property
+    def pulses(self):
+        snapshot = []
+        for k in range(self._numPulses):
+            off = self._pulseOffset[k]
+            colour = [-1 if c == 0x1000000 else c for c in self._pulseColours[off:off + self._pulseWidth[k]]]
+            m = self._pulseMap[k]
+            p = self.pulse(self._pulseSpeed[k], colour, 0, self._pulseMapKeys[m] if m >= 0 else None)
+            p._position = self._pulsePos[k]
+            p.index = p._position // 100
+            snapshot.append(p)
+        return snapshot
+
+    ## @brief Add a pulse to the stick's pulses    
     #
     # \param speed The speed of the pulse in units of (pixels moved per frame) * 100. A value of 100 means the pulse will move 1 pixels per frame. A speed of 1 will move a pulse 1 pixel every 100 frames. Speed can be positive or negative to allow pulses to move in either direction.
     # \param colour A list of 32-bit GlowBit colours for the pulse. The pulse will have a width equal to the number of elements in this list. A list entry of -1 will have the colour set by a colour map function.
     # \param index The initial index of the pulse. Generally recommended to set to 0 if speed > 0 and numLEDs if speed < 0.
-    # \param colourMap Either the string "Solid" or "Rainbow" or a custom function pointer. Custom functions must take the positional arguments: colourMapFunction(self, index, minIndex, maxIndex). When calling colour map functions updatePulses() sets minIndex to 0 and maxIndex to numLEDs.
+    # \param colourMap Either the string "Rainbow", a colourGradient object, a custom function pointer or None. Custom functions must take the positional arguments: colourMapFunction(index, minIndex, maxIndex). minIndex is set to 0 and maxIndex to numLEDs. The colour map is evaluated once for every LED when a pulse first uses it. List entries of -1 are drawn black if colourMap is None.
 
     def addPulse(self, speed = 100, colour = [0xFFFFFF], index = 0, colourMap = None):
-        self.pulses.append(self.pulse(speed, colour, index, colourMap))
-    
-
-    ## @brief Update the position of all pulses in self.pulses[] and draw them to the internal buffer.
-    #
-    # A call to pixelsShow() must be done manually to update the physical LEDs.
+        if type(colour) is not list:
+            colour = [colour]
+        n = self._numPulses
+        if n == len(self._pulsePos):
+            grow = array.array("i", [0 for _ in range(n)])
+            self._pulsePos.extend(grow)
+            self._pulseSpeed.extend(grow)
+            self._pulseMap.extend(grow)
+            grow = array.array("I", [0 for _ in range(n)])
+            self._pulseWidth.extend(grow)
+            self._pulseOffset.extend(grow)
+        used = self._pulseColoursUsed
+        if used + len(colour) > len(self._pulseColours):
+            self._pulseColours.extend(array.array("I", [0 for _ in range(max(len(self._pulseColours), len(colour)))]))
+        for c in colour:
+            # Valid colours have 24 bits, so a pixel set by the colour map is marked with bit 24
+            self._pulseColours[used] = 0x1000000 if c == -1 else c & 0xFFFFFF
+            used += 1
+        self._pulsePos[n] = int(index)*100
+        self._pulseSpeed[n] = int(speed)
+        self._pulseWidth[n] = len(colour)
+        self._pulseOffset[n] = self._pulseColoursUsed
+        self._pulseMap[n] = self._pulseMapIndex(colourMap)
+        self._pulseColoursUsed = used
+        self._numPulses = n + 1
+
+    # Returns the index into _pulseMapTables of a colour map's table, creating it if needed, or -1 if colourMap isn't a colour map
+    def _pulseMapIndex(self, colourMap):
+        if colourMap == "Rainbow":
+            colourMap = _builtinGradient("Rainbow")
+        if not callable(colourMap):
+            return -1
+        keys = self._pulseMapKeys
+        for k in range(len(keys)):
+            if keys[k] is colourMap:
+                return k
+        if len(keys) >= 8:
+            # Discard the tables of colour maps which no live pulse uses
+            used = [False for _ in keys]
+            for k in range(self._numPulses):
+                if self._pulseMap[k] >= 0:
+                    used[self._pulseMap[k]] = True
+            newIndex = []
+            newKeys = []
+            newTables = []
+            for k in range(len(keys)):
+                newIndex.append(len(newKeys))
+                if used[k]:
+                    newKeys.append(keys[k])
+                    newTables.append(self._pulseMapTables[k])
+            for k in range(self._numPulses):
+                if self._pulseMap[k] >= 0:
+                    self._pulseMap[k] = newIndex[self._pulseMap[k]]
+            self._pulseMapKeys = keys = newKeys
+            self._pulseMapTables = newTables
+        self._pulseTableStack = None
+        keys.append(colourMap)
+        self._pulseMapTables.append(array.array("I", [int(colourMap(i, 0, self.numLEDs)) & 0xFFFFFF for i in range(self.numLEDs)]))
+        return len(keys) - 1
+
+    ## @brief Returns the number of pulses which are still on the display
+    def getPulseCount(self):
+        return self._numPulses
+
+    ## @brief Removes all pulses
+    def clearPulses(self):
+        self._numPulses = 0
+        self._pulseColoursUsed = 0
+        self._pulseMapKeys = []
+        self._pulseMapTables = []
+        self._pulseTableStack = None
+
+    ## @brief Update the position of all pulses and draw them to the internal buffer.
+    #
+    # Pulses are drawn with saturating addition, so overlapping pulses don't corrupt each other's colours. Pulses which have moved off the display are removed.
+    #
+    # A call to pixelsShow() must be done manually to update the physical LEDs. On the Raspberry Pi all pulses are drawn and moved at once with NumPy when it is installed.
 
     def updatePulses(self):
-        for p in self.pulses:
-            i = p.index
-            for c in p.colour:
-                if c == -1:
-                    if callable(p.colourMap):
-                        c = p.colourMap(i, 0, self.numLEDs)
-                    else:
-                        c = 0
-                if i >=0 and i < self.numLEDs:
-                    self.pixelSaturatingAdd(i, c)
-                i -= 1
-            p._update()
-            
-        for p in reversed(self.pulses):
-            if p.index - len(p.colour) >= self.numLEDs:
-                self.pulses.remove(p)
-            if p.index + len(p.colour) < 0:
-                self.pulses.remove(p)
-       
+        if numpy is not None:
+            self._updatePulsesNumpy()
+        else:
+            self._updatePulses()
+
+    # Saturating addition of non-negative values can be done in any order and saturated once, so the NumPy path sums every pulse's contribution to each LED then clips each channel at 255.
+    def _updatePulsesNumpy(self):
+        n = self._numPulses
+        if n == 0:
+            return
+        N = self.numLEDs
+        used = self._pulseColoursUsed
+        pos = numpy.frombuffer(self._pulsePos, dtype=numpy.int32)[:n]
+        speed = numpy.frombuffer(self._pulseSpeed, dtype=numpy.int32)[:n]
+        width = numpy.frombuffer(self._pulseWidth, dtype=numpy.uint32)[:n]
+        offset = numpy.frombuffer(self._pulseOffset, dtype=numpy.uint32)[:n]
+        maps = numpy.frombuffer(self._pulseMap, dtype=numpy.int32)[:n]
+        pool = numpy.frombuffer(self._pulseColours, dtype=numpy.uint32)[:used]
+
+        # The pulse, LED index and colour of every pulse pixel. Pulses' colours are stored contiguously in pulse order.
+        pulseOf = numpy.repeat(numpy.arange(n), width)
+        x = (pos // 100)[pulseOf] - (numpy.arange(used) - offset[pulseOf])
+        colour = pool.astype(numpy.int64)
+        mapped = colour == 0x1000000
+        colour[mapped] = 0
+        visible = (x >= 0) & (x < N)
+        fromTable = mapped & visible & (maps[pulseOf] >= 0)
+        if fromTable.any():
+            if self._pulseTableStack is None:
+                self._pulseTableStack = numpy.stack([numpy.frombuffer(t, dtype=numpy.uint32) for t in self._pulseMapTables])
+            colour[fromTable] = self._pulseTableStack[maps[pulseOf][fromTable], x[fromTable]]
+        x = x[visible]
+        colour = colour[visible]
+        if len(x) > 0:
+            a = numpy.frombuffer(self.ar, dtype=numpy.uint32)
+            touched = numpy.bincount(x, minlength=N) > 0
+            total = 0
+            for shift in (16, 8, 0):
+                channel = ((a[touched] >> shift) & 0xFF) + numpy.bincount(x, weights=(colour >> shift) & 0xFF, minlength=N)[touched].astype(numpy.int64)
+                total = total | (numpy.minimum(channel, 255) << shift)
+            a[touched] = total
+            self._dirtyMin = min(self._dirtyMin, int(x.min()))
+            self._dirtyMax = max(self._dirtyMax, int(x.max()) + 1)
+
+        pos += speed
+        head = pos // 100
+        alive = (head - width.astype(numpy.int64) < N) & (head + width.astype(numpy.int64) >= 0)
+        if not alive.all():
+            live = int(alive.sum())
+            for column in (pos, speed, width, maps):
+                column[:live] = column[alive]
+            colours = pool[alive[pulseOf]]
+            pool[:len(colours)] = colours
+            offset[:live] = numpy.cumsum(width[:live]) - width[:live]
+            self._numPulses = live
+            self._pulseColoursUsed = len(colours)
+
+    @micropython.viper
+    def _updatePulses(self):
+        ar = ptr32(self.ar)
+        pos = ptr32(self._pulsePos)
+        speed = ptr32(self._pulseSpeed)
+        width = ptr32(self._pulseWidth)
+        offset = ptr32(self._pulseOffset)
+        maps = ptr32(self._pulseMap)
+        pool = ptr32(self._pulseColours)
+        tables = self._pulseMapTables
+        N = int(self.numLEDs)
+        lo = int(self._dirtyMin)
+        hi = int(self._dirtyMax)
+        live = 0
+        used = 0
+        for k in range(int(self._numPulses)):
+            p = pos[k]
+            w = width[k]
+            off = offset[k]
+            m = maps[k]
+            table = pool
+            if m >= 0:
+                table = ptr32(tables[m])
+            # Pixel i = p // 100 is the head of the pulse, rounded down for negative positions too
+            if p >= 0:
+                i = p // 100
+            else:
+                i = -((99 - p) // 100)
+            for j in range(w):
+                x = i - j
+                if x >= 0 and x < N:
+                    b = pool[off + j]
+                    if b == 0x1000000:
+                        if m >= 0:
+                            b = table[x]
+                        else:
+                            b = 0
+                    # All three channels are added at once; see _addSaturating()
+                    a = ar[x] & 0xFFFFFF
+                    s = ((a & 0x7F7F7F) + (b & 0x7F7F7F)) ^ ((a ^ b) & 0x808080)
+                    carry = ((a & b) | ((a | b) & ~s)) & 0x808080
+                    ar[x] = s | ((carry >> 7) * 0xFF)
+                    if x < lo:
+                        lo = x
+                    if x >= hi:
+                        hi = x + 1
+            p += speed[k]
+            if p >= 0:
+                i = p // 100
+            else:
+                i = -((99 - p) // 100)
+            # Pulses still on the display are moved down to keep the arrays contiguous
+            if i - w < N and i + w >= 0:
+                pos[live] = p
+                speed[live] = speed[k]
+                width[live] = w
+                maps[live] = m
+                offset[live] = used
+                for j in range(w):
+                    pool[used + j] = pool[off + j]
+                live += 1
+                used += w
+        self._numPulses = live
+        self._pulseColoursUsed = used
+        self._dirtyMin = lo
+        self._dirtyMax = hi
+
+    ## @brief Coroutine which animates pulses once per frame. Intended to be run as an asyncio task.
+    #
+    # Each frame the display is optionally cleared, updatePulses() is called, then pixelsShowAsync() updates the physical LEDs. Pulses can be added with addPulse() while this coroutine runs.
+    #
+    # \param iters The number of frames to draw. A value of -1 runs forever.
+    # \param clear If True the display is filled with black before the pulses are drawn each frame.
+
+    async def updatePulsesAsync(self, iters = -1, clear = True):
+        while iters != 0:
+            if clear == True:
+                self.pixelsFill(0)
+            self.updatePulses()
+            await self.pixelsShowAsync()
+            if iters > 0:
+                iters -= 1
 
     ## @brief One dimensional graph ofject for drawing a graph bar on a GlowBit Stick display
     class graph1D(colourFunctions, colourMaps):
@@ -1099,7 +3187,7 @@ class stick(glowbit):
         # \param minValue The numerical value of the start of the graph
         # \param maxValue The numerical value of the end of the graph
         # \param colour The graph's colour if using the Solid colourmap
-        # \param colourMap Either the string "Solid" or "Rainbow" or a function pointer to a custom colour map. Custom colour maps must take the parameters colourMap(Self, index, minIndex, maxIndex).
+        # \param colourMap Either the string "Solid" or "Rainbow", a colourGradient object, or a function pointer to a custom colour map. Custom colour maps must take the parameters colourMap(Self, index, minIndex, maxIndex).
         # \param update If this is set to True then a call to updateGraph1D() will automatically call pixelsShow() to update the physical display.
 
         def __init__(self, minIndex = 0, maxIndex = 7, minValue=0, maxValue=255, colour = 0xFFFFFF, colourMap = "Solid", update = False):
@@ -1120,7 +3208,26 @@ class stick(glowbit):
             elif colourMap == "Solid":
                 self.colourMap = self.colourMapSolid
             elif colourMap == "Rainbow":
-                self.colourMap = self.colourMapRainbow
+                self.colourMap = _builtinGradient("Rainbow")
+            else:
+                print("Invalid colourMap \"", colourMap, "\".")
+                print("Valid options: Solid, Rainbow, a colourGradient object or a colour map function")
+                print("Defaulting to Solid")
+                self.colourMap = self.colourMapSolid
+
+            # The LED index of each pixel of the bar
+            self._indices = array.array("I", range(minIndex, maxIndex+1))
+            # The number of pixels lit when the graph was last drawn, to the buffer _ar, or -1 if it hasn't been drawn
+            self._level = -1
+            self._ar = None
+            self._clearCount = 0
+            self._cacheColours()
+
+        # Computes the colour of each pixel of the bar
+        def _cacheColours(self):
+            self._colours = array.array("I", [self.colourMap(idx, self.minIndex, self.maxIndex) for idx in range(self.minIndex, self.maxIndex+1)])
+            self._cachedColour = self.colour
+            self._cachedMap = self.colourMap
  
     ## @brief Wrapper function to create graph1D objects. Returns a new stick.graph1D() object.
     #
@@ -1131,7 +3238,7 @@ class stick(glowbit):
     # \param minValue The numerical value of the start of the graph
     # \param maxValue The numerical value of the end of the graph
     # \param colour The graph's colour if using the Solid colourmap
-    # \param colourMap Either the string "Solid" or "Rainbow" or a function pointer to a custom colour map. Custom colour maps must take the parameters colourMap(Self, index, minIndex, maxIndex).
+    # \param colourMap Either the string "Solid" or "Rainbow", a colourGradient object, or a function pointer to a custom colour map. Custom colour maps must take the parameters colourMap(Self, index, minIndex, maxIndex).
     # \param update If this is set to True then a call to updateGraph1D() will automatically call pixelsShow() to update the physical display.
 
     def newGraph1D(self, minIndex = 0, maxIndex = 7, minValue = 0, maxValue = 255, colour = 0xFFFFFF, colourMap = "Solid", update = False):
@@ -1141,16 +3248,15 @@ class stick(glowbit):
     # 
     # If the graph1D object was created with "update = True" this function will call pixelsShow() to update the physical display before returning.
     #
+    # Only the pixels between the previously drawn value and the new value are written. The whole graph is redrawn on its first update, after pixelsFill() or blankDisplay(), when drawing to a different layer, or when the graph's colour or colourMap has been changed.
+    #
     # \param graph A graph1D object as returned by stick.graph1D
     # \param value The numerical value to plot on the graph
+    # \param force If True every pixel of the graph is redrawn. Use this if other drawing methods have overwritten part of the graph.
 
-    def updateGraph1D(self, graph, value):
-        i = round(graph.m*value + graph.offset)
-        m = graph.colourMap
-        for idx in range(graph.minIndex, i+1):
-            self.pixelSet(idx, m(idx, graph.minIndex, graph.maxIndex))
-        for idx in range(i+1, graph.maxIndex+1):
-            self.pixelSet(idx, 0)
+    def updateGraph1D(self, graph, value, force = False):
+        level = round(graph.m*value + graph.offset) - graph.minIndex + 1
+        self._drawGraph1D(graph, 0 if level < 0 else len(graph._indices) if level > len(graph._indices) else level, force)
         if graph.update == True:
             self.pixelsShow()
         
@@ -1168,7 +3274,7 @@ class stick(glowbit):
         for k in range(i, j+1):
             self.pixelSet(k, colour)
 
-    ## @brief A demonstration of the use of "pulse" objects
+    ## @brief A demonstration of the use of pulses
     # 
     # The pulse traveling "up" the stick is drawn with default arguments: a single white pixel
     # 
@@ -1229,12 +3335,13 @@ class stick(glowbit):
         self.pixelsFill(0)
         self.pixelsShow()
 
-    ## @brief Uses the colourMapRainbow() colour map to display a colourful animation
+    ## @brief Uses the "Rainbow" colour gradient to display a colourful animation
     def rainbowDemo(self, iters = 5):
+        lut = _builtinGradient("Rainbow").lut
         while iters > 0:
             for offset in range(33):
                 for i in range(8):
-                    self.pixelSet(i, self.colourMapRainbow(i,offset, offset+32))
+                    self.pixelSet(i, lut[int(((i-offset)*255)/32) % 255])
                 self.pixelsShow()
             iters -= 1
 
@@ -1261,9 +3368,13 @@ class rainbow(stick):
     # \param pin The GPIO pin connected to the GlowBit Rainbow module. Defaults to 18 as that pin is compatible with the Raspberry Pi and Raspberry Pi Pico. Any pin can be used on the Raspberry Pi Pico, only pins 18 and 12 are valid on the Raspberry Pi.
     # \param brightness The relative brightness of the LEDs. Colours drawn to the internal buffer should be in the range [0,255] and the brightness parameter scales this value before drawing to the physical display. If brightness is an integer it should be in the range [0,255]. If brightness is floating point it is assumed to be in the range [0,1.0].
     # \param rateLimitFPS The maximum frame rate of the display in frames per second. The pixelsShow() function blocks to enforce this limit.
+    # \param sm (Raspberry Pi Pico only) The PIO state machine to generate the GlowBit data stream. Each connected GlowBit display chain requires a unique state machine. Valid values are in the range [0,7].
+    # \param gcPolicy (Raspberry Pi Pico only) When pixelsShow() runs the garbage collector. One of "EveryFrame", "EveryNFrames", "Threshold" or "Never". See updateGCPolicy().
+    # \param backend The output backend which transmits frames. One of "Hardware" (the GlowBit display connected to pin), "Null" (frames are discarded), "Recording" (frames are recorded by a recordingBackend) or a backend class; see registerBackend(). If not given the GLOWBIT_BACKEND environment variable is used, defaulting to "Hardware".
+    # \param segments Splits the display across several outputs which transmit at the same time. A list of (pin, range(start, stop)) or (pin, start, stop) segments, each driving LEDs [start, stop) from its own pin; pin is then ignored. On the Raspberry Pi Pico each segment uses its own state machine, numbered upwards from sm. On the Raspberry Pi at most two segments are valid, one on pin 18 or 12 and one on pin 13 or 19. If None the whole display is driven from pin.
 
-    def __init__(self, numLEDs = 13, pin = 18, brightness = 40, rateLimitFPS = 60, sm = 0):
-        super().__init__(numLEDs, pin, brightness, rateLimitFPS, sm)
+    def __init__(self, numLEDs = 13, pin = 18, brightness = 40, rateLimitFPS = 60, sm = 0, gcPolicy = "EveryFrame", backend = None, segments = None):
+        super().__init__(numLEDs, pin, brightness, rateLimitFPS, sm, gcPolicy, backend, segments)
         self.drawRainbow()
 
     ## @brief Sets the colour of a pixel on the GlowBit Rainbow, addressed by its angle label.
@@ -1308,26 +3419,16 @@ class triangle(glowbit):
     # \param brightness The relative brightness of the LEDs. Colours drawn to the internal buffer should be in the range [0,255] and the brightness parameter scales this value before drawing to the physical display. If brightness is an integer it should be in the range [0,255]. If brightness is floating point it is assumed to be in the range [0,1.0].
     # \param rateLimitFPS The maximum frame rate of the display in frames per second. The pixelsShow() function blocks to enforce this limit.
     # \param sm (Raspberry Pi Pico only) The PIO state machine to generate the GlowBit data stream. Each connected GlowBit display chain requires a unique state machine. Valid values are in the range [0,7].
+    # \param gcPolicy (Raspberry Pi Pico only) When pixelsShow() runs the garbage collector. One of "EveryFrame", "EveryNFrames", "Threshold" or "Never". See updateGCPolicy().
+    # \param backend The output backend which transmits frames. One of "Hardware" (the GlowBit display connected to pin), "Null" (frames are discarded), "Recording" (frames are recorded by a recordingBackend) or a backend class; see registerBackend(). If not given the GLOWBIT_BACKEND environment variable is used, defaulting to "Hardware".
+    # \param segments Splits the display across several outputs which transmit at the same time. A list of (pin, range(start, stop)) or (pin, start, stop) segments, each driving LEDs [start, stop) from its own pin; pin is then ignored. On the Raspberry Pi Pico each segment uses its own state machine, numbered upwards from sm. On the Raspberry Pi at most two segments are valid, one on pin 18 or 12 and one on pin 13 or 19. If None the whole display is driven from pin.
 
-    def __init__(self, numTris = 1, LEDsPerTri = 6, pin = 18, brightness = 20, rateLimitFPS = 20, sm = 0):
-        if _SYSNAME == 'rp2':
-            self.sm = rp2.StateMachine(sm, self._ws2812, freq=8_000_000, sideset_base=Pin(pin))
-            self.sm.active(1)
-            self.pixelsShow = self._pixelsShowPico
-            self.ticks_ms = time.ticks_ms
-
+    def __init__(self, numTris = 1, LEDsPerTri = 6, pin = 18, brightness = 20, rateLimitFPS = 20, sm = 0, gcPolicy = "EveryFrame", backend = None, segments = None):
         self.LEDsPerTri = LEDsPerTri
         self.numLEDs = numTris*LEDsPerTri
         self.numTris = numTris
 
-        if _SYSNAME == 'Linux':
-            self.strip = ws.PixelStrip(self.numLEDs, pin)
-            self.strip.begin()
-            self.pixelsShow = self._pixelsShowRPi
-            self.ticks_ms = self._ticks_ms_Linux
-
-        self.ar = array.array("I", [0 for _ in range(self.numLEDs)])
-        self.dimmer_ar = array.array("I", [0 for _ in range(self.numLEDs)])
+        self._initOutput(pin, sm, backend, gcPolicy, segments)
         
         if rateLimitFPS > 0: 
             self.rateLimit = rateLimitFPS
@@ -1340,7 +3441,6 @@ class triangle(glowbit):
             self.brightness = int(brightness)
         
         self.pixelsFill(0)
-        self.lastFrame_ms = self.ticks_ms()
         self.pixelsShow()
         
     ## @brief Fills all LEDs on a given triangle with the same colour.
@@ -1352,6 +3452,7 @@ class triangle(glowbit):
         addr = self.LEDsPerTri*tri
         for i in range(addr, addr+self.LEDsPerTri):
             self.ar[i] = colour
+        self.markDirty(addr, addr+self.LEDsPerTri)
 
     ## @brief Displays a simple demo pattern
 
@@ -1381,15 +3482,12 @@ class matrix4x4(glowbitMatrix):
     # \param mapFunction A function pointer to a custom pixel mapping function. Only required if mapping pixels to non-standard tiling arrangements.
     # \param rateLimitFPS The maximum frame rate of the display in frames per second. The pixelsShow() function blocks to enforce this limit.
     # \param sm (Raspberry Pi Pico only) The PIO state machine to generate the GlowBit data stream. Each connected GlowBit display chain requires a unique state machine. Valid values are in the range [0,7].
+    # \param gcPolicy (Raspberry Pi Pico only) When pixelsShow() runs the garbage collector. One of "EveryFrame", "EveryNFrames", "Threshold" or "Never". See updateGCPolicy().
+    # \param backend The output backend which transmits frames. One of "Hardware" (the GlowBit display connected to pin), "Null" (frames are discarded), "Recording" (frames are recorded by a recordingBackend) or a backend class; see registerBackend(). If not given the GLOWBIT_BACKEND environment variable is used, defaulting to "Hardware".
+    # \param segments Splits the display across several outputs which transmit at the same time. A list of (pin, range(start, stop)) or (pin, start, stop) segments, each driving LEDs [start, stop) from its own pin; pin is then ignored. On the Raspberry Pi Pico each segment uses its own state machine, numbered upwards from sm. On the Raspberry Pi at most two segments are valid, one on pin 18 or 12 and one on pin 13 or 19. If None the whole display is driven from pin.
 
 
-    def __init__(self, tiles = 1, pin = 18, brightness = 20, mapFunction = None, rateLimitFPS = 30, sm = 0):
-        if _SYSNAME == 'rp2':
-            self.sm = rp2.StateMachine(sm, self._ws2812, freq=8_000_000, sideset_base=Pin(pin))
-            self.sm.active(1)
-            self.pixelsShow = self._pixelsShowPico
-            self.ticks_ms = time.ticks_ms
-
+    def __init__(self, tiles = 1, pin = 18, brightness = 20, mapFunction = None, rateLimitFPS = 30, sm = 0, gcPolicy = "EveryFrame", backend = None, segments = None):
         self.tiles = tiles
         self.numLEDs = tiles*16
         self.numLEDsX = tiles*4
@@ -1399,15 +3497,7 @@ class matrix4x4(glowbitMatrix):
         # Convenience variable; equal to numLEDsY
         self.numRows = self.numLEDsY
 
-        if _SYSNAME == 'Linux':
-            self.strip = ws.PixelStrip(self.numLEDs, pin)
-            self.strip.begin()
-            self.pixelsShow = self._pixelsShowRPi
-            self.ticks_ms = self._ticks_ms_Linux
-
-        self.ar = array.array("I", [0 for _ in range(self.numLEDs)])
-        self.dimmer_ar = array.array("I", [0 for _ in range(self.numLEDs)])
-        self.lastFrame_ms = self.ticks_ms()
+        self._initOutput(pin, sm, backend, gcPolicy, segments)
         self.scrollingText = False # Only required because the self.pixelsShow() function is shared with the 8x8
         
         if brightness <= 1.0 and isinstance(brightness, float):
@@ -1419,6 +3509,7 @@ class matrix4x4(glowbitMatrix):
             self.remap = mapFunction
         else:
             self.remap = self.remap4x4
+        self.updateRemap()
             
         if rateLimitFPS > 0: 
             self.rateLimit = rateLimitFPS
@@ -1479,8 +3570,11 @@ class matrix8x8(glowbitMatrix):
     # \param rateLimitFPS The maximum frame rate of the display in frames per second. The pixelsShow() function blocks to enforce this limit. This argument defaults to -1 to allow rateLimitCharactersPerSecond to preference this parameter if it is not set. If neither rateLimitFPS or rateLimitCharactersPerSecond are set the limit is set to 30 FPS.
     # \param rateLimitCharactersPerSecond If given a positive value the display update rate is set to display this many characters of scrolling text per second. A value of 1 is fast, but readable. This value can be fractional (eg: 0.5).
     # \param sm (Raspberry Pi Pico only) The PIO state machine to generate the GlowBit data stream. Each connected GlowBit display chain requires a unique state machine. Valid values are in the range [0,7].
+    # \param gcPolicy (Raspberry Pi Pico only) When pixelsShow() runs the garbage collector. One of "EveryFrame", "EveryNFrames", "Threshold" or "Never". See updateGCPolicy().
+    # \param backend The output backend which transmits frames. One of "Hardware" (the GlowBit display connected to pin), "Null" (frames are discarded), "Recording" (frames are recorded by a recordingBackend) or a backend class; see registerBackend(). If not given the GLOWBIT_BACKEND environment variable is used, defaulting to "Hardware".
+    # \param segments Splits the display across several outputs which transmit at the same time. A list of (pin, range(start, stop)) or (pin, start, stop) segments, each driving LEDs [start, stop) from its own pin; pin is then ignored. On the Raspberry Pi Pico each segment uses its own state machine, numbered upwards from sm. On the Raspberry Pi at most two segments are valid, one on pin 18 or 12 and one on pin 13 or 19. If None the whole display is driven from pin.
 
-    def __init__(self, tileRows = 1, tileCols = 1, pin = 18, brightness = 20, mapFunction = None, rateLimitFPS = -1, rateLimitCharactersPerSecond = -1, sm = 0):
+    def __init__(self, tileRows = 1, tileCols = 1, pin = 18, brightness = 20, mapFunction = None, rateLimitFPS = -1, rateLimitCharactersPerSecond = -1, sm = 0, gcPolicy = "EveryFrame", backend = None, segments = None):
     
         self.tileRows = tileRows
         self.tileCols = tileCols
@@ -1492,20 +3586,7 @@ class matrix8x8(glowbitMatrix):
         # Convenience variable; equal to numLEDsY
         self.numRows = self.numLEDsY
         
-        if _SYSNAME == 'rp2':
-            self.sm = rp2.StateMachine(sm, self._ws2812, freq=8_000_000, sideset_base=Pin(pin))
-            self.sm.active(1)
-            self.pixelsShow = self._pixelsShowPico
-            self.ticks_ms = time.ticks_ms
-
-        if _SYSNAME == 'Linux':
-            self.strip = ws.PixelStrip(self.numLEDs, pin)
-            self.strip.begin()
-            self.pixelsShow = self._pixelsShowRPi
-            self.ticks_ms = self._ticks_ms_Linux
-
-        self.ar = array.array("I", [0 for _ in range(self.numLEDs)])
-        self.dimmer_ar = array.array("I", [0 for _ in range(self.numLEDs)])
+        self._initOutput(pin, sm, backend, gcPolicy, segments)
         
         if brightness <= 1.0 and isinstance(brightness, float):
             self.brightness = int(brightness*255)
@@ -1515,8 +3596,6 @@ class matrix8x8(glowbitMatrix):
         # Set to True while a scrolling text object is available to be drawn.
         self.scrollingText = False
         
-        self.lastFrame_ms = self.ticks_ms()
-        
         if rateLimitFPS > 0: 
             self.rateLimit = rateLimitFPS
         elif rateLimitCharactersPerSecond > 0:
@@ -1525,12 +3604,14 @@ class matrix8x8(glowbitMatrix):
             self.rateLimit = 30
         
         self.scrollingTextList = []
+        self.updateGlyphCache()
         
         if callable(mapFunction) is True:
             self.remap = mapFunction
             print(self.remap)
         else:
             self.remap = self.remap8x8
+        self.updateRemap()
             
         # Blank display
         self.blankDisplay()
@@ -1565,6 +3646,12 @@ class matrix8x8(glowbitMatrix):
             self.colour = colour
             self.bgColour = bgColour
             self.string = string
+            # The rendered text; one byte per pixel column with bit n set if the pixel in row n is lit
+            self.columns = bytearray(8*len(string))
+            font = _font()
+            for k in range(len(string)):
+                charIdx = (ord(string[k])-32)*8
+                self.columns[8*k:8*k+8] = font[charIdx:charIdx+8]
     
     ## @brief Adds a line of scrolling text to the display.
     #
@@ -1599,22 +3686,67 @@ class matrix8x8(glowbitMatrix):
     # addTextScroll() must be called at least once for scrolling text to be drawn to the display.
 
     def updateTextScroll(self):
+        self._drawTextScroll()
+        if self.updateText == True:
+            self.pixelsShow()
+        if len(self.scrollingTextList) == 0:
+            self.scrollingText = False
+
+    ## @brief Coroutine which animates scrolling text once per frame until all lines added with addTextScroll() have scrolled off the display. Intended to be run as an asyncio task.
+    #
+    # This is the asyncio equivalent of calling addTextScroll() with blocking = True; other tasks run between frames.
+
+    async def updateTextScrollAsync(self):
+        while self.scrollingText:
+            self._drawTextScroll()
+            if len(self.scrollingTextList) == 0:
+                self.scrollingText = False
+            await self.pixelsShowAsync()
+
+    def _drawTextScroll(self):
         for textLine in self.scrollingTextList:
-            x = 0
-            self.drawRectangleFill(0,textLine.y,self.numLEDsX, textLine.y+7, textLine.bgColour)
-            for c in textLine.string:
-                self.drawChar(c, -textLine.x+8*x, textLine.y, textLine.colour)
-                x += 1
+            self._drawTextColumns(textLine.columns, textLine.x, textLine.y, textLine.colour, textLine.bgColour)
             textLine.x += 1
                             
         for textLine in reversed(self.scrollingTextList):
             if textLine.x == 8*len(textLine.string)+1:
                 self.scrollingTextList.remove(textLine)
-        
-        if self.updateText == True:
-            self.pixelsShow()
-        if len(self.scrollingTextList) == 0:
-            self.scrollingText = False
+
+    # Draws the 8 row high window of the rendered text columns which starts at column start across the full width of the display, with its top edge at y. Lit pixels are drawn as bgColour + colour and unlit pixels as bgColour. Rows outside the display are clipped.
+    @micropython.viper
+    def _drawTextColumns(self, columns, start: int, y: int, colour: int, bgColour: int):
+        ar = ptr32(self.ar)
+        cols = ptr8(columns)
+        numCols = int(len(columns))
+        lut = self._remapLUT
+        numX = int(self.numLEDsX)
+        numY = int(self.numLEDsY)
+        fg = bgColour + colour
+        minRow = 0
+        if y < 0:
+            minRow = -y
+        maxRow = 8
+        if y + 8 > numY:
+            maxRow = numY - y
+        lo = int(self._dirtyMin)
+        hi = int(self._dirtyMax)
+        for x in range(numX):
+            c = x + start
+            dat = 0
+            if c >= 0 and c < numCols:
+                dat = int(cols[c])
+            for row in range(minRow, maxRow):
+                i = int(lut[(y+row)*numX + x])
+                if (dat >> row) & 1:
+                    ar[i] = fg
+                else:
+                    ar[i] = bgColour
+                if i < lo:
+                    lo = i
+                if i >= hi:
+                    hi = i + 1
+        self._dirtyMin = lo
+        self._dirtyMax = hi
 
     ## @brief Maps an (x,y) coordinate on a tiled GlowBit Matrix 8x8 array to an internal buffer array index.
     #
@@ -1661,30 +3793,93 @@ class matrix8x8(glowbitMatrix):
         if Px < -7 or Px > int(self.numLEDsX):
             return
         ar = ptr32(self.ar)
-        remap = self.remap
-        x = Px
-        y = Py
-        charIdx = (int(ord(char))-32)*8
-        N = int(self.numLEDs)
-        maxCol = int(min(8, int(self.numLEDsX)-Px))
-        if x < 0:
-            minCol = -1*x
-            x = 0
+        lut = self._remapLUT
+        numX = int(self.numLEDsX)
+        numY = int(self.numLEDsY)
+        glyph = self._glyph(char)
+        g = ptr8(glyph)
+        n = int(len(glyph))
+        lo = int(self._dirtyMin)
+        hi = int(self._dirtyMax)
+        # Each glyph pixel is stored as (column << 3) | row
+        if Px >= 0 and Py >= 0 and Px + 8 <= numX and Py + 8 <= numY:
+            base = Py*numX + Px
+            for k in range(n):
+                o = int(g[k])
+                i = int(lut[base + (o & 7)*numX + (o >> 3)])
+                ar[i] += colour
+                if i < lo:
+                    lo = i
+                if i >= hi:
+                    hi = i + 1
         else:
-            minCol = 0
-        tileCols = int(self.tileCols)
-        for col in range(minCol, maxCol):
-            dat = int(petme128[charIdx + col])
-            ar[int(remap(x,y))] += ((dat)&1)*(colour)
-            ar[int(remap(x,y+1))] += ((dat>>1)&1)*colour
-            ar[int(remap(x,y+2))] += ((dat>>2)&1)*colour
-            ar[int(remap(x,y+3))] += ((dat>>3)&1)*colour
-            ar[int(remap(x,y+4))] += ((dat>>4)&1)*colour
-            ar[int(remap(x,y+5))] += ((dat>>5)&1)*colour
-            ar[int(remap(x,y+6))] += ((dat>>6)&1)*colour
-            ar[int(remap(x,y+7))] += ((dat>>7)&1)*colour
-            x += 1
+            # Pixels falling outside the display are clipped
+            for k in range(n):
+                o = int(g[k])
+                x = Px + (o >> 3)
+                y = Py + (o & 7)
+                if x >= 0 and x < numX and y >= 0 and y < numY:
+                    i = int(lut[y*numX + x])
+                    ar[i] += colour
+                    if i < lo:
+                        lo = i
+                    if i >= hi:
+                        hi = i + 1
+        self._dirtyMin = lo
+        self._dirtyMax = hi
     
+    # Returns the glyph for char as a bytearray of its lit pixels, each stored as (column << 3) | row. Glyphs are expanded from the font on first use and kept in the glyph cache.
+    def _glyph(self, char):
+        cache = self._glyphCache
+        glyph = cache.get(char)
+        if glyph is not None:
+            self._glyphHits += 1
+            # Move the glyph to the most recently used end of the cache
+            if self._glyphMoveToEnd is not None:
+                self._glyphMoveToEnd(char)
+            else:
+                del cache[char]
+                cache[char] = glyph
+            return glyph
+        self._glyphMisses += 1
+        font = _font()
+        charIdx = (ord(char)-32)*8
+        glyph = bytearray()
+        for col in range(8):
+            dat = font[charIdx + col]
+            for row in range(8):
+                if (dat >> row) & 1:
+                    glyph.append((col << 3) | row)
+        if self._glyphCacheSize > 0:
+            if len(cache) >= self._glyphCacheSize:
+                # Evict the least recently used glyph, which is first in the cache
+                del cache[next(iter(cache))]
+            cache[char] = glyph
+        return glyph
+
+    ## @brief Sets the number of glyphs kept by drawChar()'s glyph cache.
+    #
+    # The first time a character is drawn its font bitmap is expanded into a list of lit pixels, which is kept for subsequent calls. When the cache is full the least recently used glyph is discarded. The default of 96 holds every printable ASCII character.
+    #
+    # Calling this method empties the cache and resets the statistics returned by getGlyphCacheStats().
+    #
+    # \param size The maximum number of cached glyphs. A value of 0 disables the cache.
+    def updateGlyphCache(self, size = 96):
+        from collections import OrderedDict
+        self._glyphCacheSize = int(size)
+        # Cached glyphs in order of use, least recently used first
+        self._glyphCache = OrderedDict()
+        # MicroPython's OrderedDict has no move_to_end(); glyphs are then moved by deleting and reinserting them
+        self._glyphMoveToEnd = getattr(self._glyphCache, "move_to_end", None)
+        self._glyphHits = 0
+        self._glyphMisses = 0
+
+    ## @brief Returns statistics on drawChar()'s glyph cache.
+    #
+    # \return A tuple (hits, misses, size) of the number of characters drawn from the cache, the number of characters which had to be expanded from the font and the number of glyphs currently cached.
+    def getGlyphCacheStats(self):
+        return (self._glyphHits, self._glyphMisses, len(self._glyphCache))
+
     ## @brief Changes the 8x8 matrix display's update rate in units of "characters of scrolling text per second".
     #
     # For example, a value of 2 would scroll 2 charcters per second; leaving each character at least partly visible for 0.5 seconds.
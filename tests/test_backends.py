@@ -0,0 +1,76 @@
+# Tests for the output backends. Run with: python3 -m pytest tests
+#
+# Each test runs on the pure Python path and, when NumPy is installed, on the NumPy path.
+
+import os
+import sys
+import types
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "glowbit"))
+
+import glowbit
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+paths = [None] + ([numpy] if numpy is not None else [])
+
+# Stand-in for rpi_ws281x.PixelStrip with the library's indexing semantics
+class FakePixelStrip():
+    def __init__(self, num, pin, *args, **kwargs):
+        self.leds = [0 for _ in range(num)]
+
+    def begin(self):
+        pass
+
+    def setPixelColor(self, n, colour):
+        self.leds[n] = colour
+
+    def __setitem__(self, pos, value):
+        if isinstance(pos, slice):
+            # rpi_ws281x writes the one value to every LED in the slice and ws2811_led_set() rejects anything but an integer
+            if not isinstance(value, int):
+                raise TypeError("in method 'ws2811_led_set', argument 3 of type 'uint32_t'")
+            for n in range(*pos.indices(len(self.leds))):
+                self.leds[n] = value
+        else:
+            self.leds[pos] = value
+
+    def show(self):
+        pass
+
+@pytest.fixture(params = paths, ids = ["python", "numpy"][:len(paths)])
+def displays(request, monkeypatch):
+    ws = types.ModuleType("rpi_ws281x")
+    ws.PixelStrip = FakePixelStrip
+    monkeypatch.setitem(sys.modules, "rpi_ws281x", ws)
+    strip = glowbit.stick(numLEDs = 16, brightness = 255, backend = glowbit.ws281xBackend)
+    recording = glowbit.stick(numLEDs = 16, brightness = 255, backend = "Recording")
+    monkeypatch.setattr(glowbit, "numpy", request.param)
+    return strip, recording
+
+def _draw(displays, i, colour):
+    for d in displays:
+        d.pixelSet(i, colour)
+        d.pixelsShow()
+
+def test_ws281x_backend_writes_each_led(displays):
+    strip, recording = displays
+    for i in range(strip.numLEDs):
+        strip.pixelSet(i, 0x010203 * i)
+        recording.pixelSet(i, 0x010203 * i)
+    strip.pixelsShow()
+    recording.pixelsShow()
+    assert strip.backend.strip.leds == list(recording.backend.getFrames()[-1][1])
+    assert len(set(strip.backend.strip.leds)) == strip.numLEDs
+
+def test_ws281x_backend_partial_update(displays):
+    strip, recording = displays
+    _draw(displays, 3, 0xFF0000)
+    _draw(displays, 9, 0x00FF00)
+    _draw(displays, 3, 0x0000FF)
+    assert strip.backend.strip.leds == list(recording.backend.getFrames()[-1][1])
@@ -0,0 +1,59 @@
+# Tests for the whole-buffer operations. Run with: python3 -m pytest tests
+#
+# Each test runs on the pure Python path and, when NumPy is installed, on the NumPy path.
+
+import array
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "glowbit"))
+
+import glowbit
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+paths = [None] + ([numpy] if numpy is not None else [])
+
+@pytest.fixture(params = paths, ids = ["python", "numpy"][:len(paths)])
+def display(request, monkeypatch):
+    s = glowbit.stick(numLEDs = 16, backend = "Null")
+    monkeypatch.setattr(glowbit, "numpy", request.param)
+    for i in range(s.numLEDs):
+        s.ar[i] = 0x804020
+    s.pixelsShow()
+    return s
+
+@pytest.mark.parametrize("method, expected", [
+    ("bufferAddSaturating", 0xFF5030),
+    ("bufferSubSaturating", 0x013010),
+    ("bufferMax", 0x804020),
+])
+def test_short_other_changes_only_common_length(display, method, expected):
+    other = array.array("I", [0x7F1010 for _ in range(5)])
+    getattr(display, method)(other)
+    assert list(display.ar[:5]) == [expected for _ in range(5)]
+    assert list(display.ar[5:]) == [0x804020 for _ in range(11)]
+    assert display._dirtyMin == 0 and display._dirtyMax == 5
+
+@pytest.mark.parametrize("method", ["bufferAddSaturating", "bufferSubSaturating", "bufferMax"])
+def test_full_length_other_per_channel(display, method):
+    other = array.array("I", [(i*0x112233) & 0xFFFFFF for i in range(display.numLEDs)])
+    getattr(display, method)(other)
+    for i in range(display.numLEDs):
+        a = 0x804020
+        b = other[i]
+        for shift in (16, 8, 0):
+            ca = (a >> shift) & 0xFF
+            cb = (b >> shift) & 0xFF
+            c = (display.ar[i] >> shift) & 0xFF
+            if method == "bufferAddSaturating":
+                assert c == min(255, ca + cb)
+            elif method == "bufferSubSaturating":
+                assert c == max(0, ca - cb)
+            else:
+                assert c == max(ca, cb)
@@ -0,0 +1,11 @@
+# Tests that importing the library stays within the budget checked by benchmarks/importtime.py. Run with: python3 -m pytest tests
+
+import os
+import subprocess
+import sys
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def test_import_time_budget():
+    proc = subprocess.run([sys.executable, os.path.join(_ROOT, "benchmarks", "importtime.py")], capture_output = True, text = True)
+    assert proc.returncode == 0, proc.stdout + proc.stderr
@@ -0,0 +1,43 @@
+# Tests for display layers. Run with: python3 -m pytest tests
+
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "glowbit"))
+
+import glowbit
+
+def _lastFrame(display):
+    return display.backend.getFrames()[-1][1]
+
+def test_layer_draw_during_async_wait_is_shown():
+    m = glowbit.matrix8x8(backend = "Recording", brightness = 255, rateLimitFPS = 20)
+    top = m.addLayer(blend = "Key")
+    m.pixelsShow()
+
+    async def drawDuringWait():
+        # Runs while pixelsShowAsync() awaits the frame deadline
+        await asyncio.sleep(0.01)
+        m.selectLayer(top)
+        m.pixelSet(5, 0xFF0000)
+
+    async def main():
+        m.selectLayer()
+        m.pixelSet(1, 0x00FF00)
+        await asyncio.gather(m.pixelsShowAsync(), drawDuringWait())
+
+    asyncio.run(main())
+    frame = _lastFrame(m)
+    assert frame[1] == 0x00FE00
+    assert frame[5] == 0xFE0000
+    assert m._outAr[5] == 0xFF0000
+
+def test_layer_draw_after_frame_is_shown_next_frame():
+    m = glowbit.matrix8x8(backend = "Recording", brightness = 255, rateLimitFPS = 1000)
+    top = m.addLayer(blend = "Key")
+    m.pixelsShow()
+    m.selectLayer(top)
+    m.pixelSet(7, 0x0000FF)
+    m.pixelsShow()
+    assert _lastFrame(m)[7] == 0x0000FE